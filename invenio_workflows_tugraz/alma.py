@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Batched retrieval of alma records by their local_field_995."""
+
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import ContextVar
+from itertools import batched
+from operator import attrgetter
+from xml.etree.ElementTree import Element
+
+from flask import current_app
+from invenio_alma import AlmaSRUService
+from invenio_alma.proxies import current_alma
+from invenio_alma.services import AlmaAPIError, AlmaRESTError
+from invenio_alma.utils import is_duplicate_in_alma
+from invenio_records_marc21 import Marc21Metadata, convert_marc21xml_to_json
+
+from .duplicates import extract_values
+from .ratelimit import rate_limit
+
+SEARCH_KEY = "local_field_995"
+
+_active_prefetch: ContextVar[AlmaPrefetch | None] = ContextVar(
+    "active_alma_prefetch",
+    default=None,
+)
+
+_verified_absent: ContextVar[set[str] | None] = ContextVar(
+    "verified_absent_in_alma",
+    default=None,
+)
+
+
+def sru_or_query(ids: Iterable[str]) -> str:
+    """Get the search value which matches the records of all ids.
+
+    The SRU service prefixes the search value by alma.local_field_995=, the
+    following ids are joined by OR clauses on the same index.
+    """
+    return f" or alma.{SEARCH_KEY}=".join(ids)
+
+
+def split_by_id(records: list[Element], ids: list[str]) -> dict[str, Element]:
+    """Map each of ids to its record by the values of local_field_995."""
+    found = {}
+    for record in records:
+        metadata = Marc21Metadata(json=convert_marc21xml_to_json(record)).json
+        fields = metadata["metadata"].get("fields", {})
+        for id_ in extract_values(fields, "995", "a") & set(ids):
+            found.setdefault(id_, record)
+    return found
+
+
+def fetch_alma_records(
+    ids: list[str],
+    sru_service: AlmaSRUService,
+) -> dict[str, Element]:
+    """Fetch the alma records of ids by one SRU request.
+
+    ids without a record in the response are missing in the returned map.
+    """
+    with rate_limit("alma"):
+        records = sru_service.get_record(sru_or_query(ids), SEARCH_KEY)
+    return split_by_id(records, ids)
+
+
+class AlmaPrefetch:
+    """Alma records of the announced cms_ids, fetched chunk wise.
+
+    The cms_ids of an upcoming chunk are announced by the stream of entries.
+    The first record asked for out of a chunk fetches the records of the
+    whole chunk, by one SRU request, with the service of the caller.
+    """
+
+    def __init__(self) -> None:
+        """Construct AlmaPrefetch."""
+        self.pending: list[str] = []
+        self.records: dict[str, Element] = {}
+
+    def announce(self, cms_ids: list[str]) -> None:
+        """Announce the cms_ids of the next chunk."""
+        self.pending = cms_ids
+        self.records = {}
+
+    def pop(self, cms_id: str | int, alma_service: AlmaSRUService) -> Element | None:
+        """Pop the prefetched record of cms_id, fetch the chunk if necessary.
+
+        The cms_id of an entry is an int, the announced ids are strings. An
+        error of the chunk request is logged, the records of the chunk are
+        fetched one by one afterwards.
+        """
+        cms_id = str(cms_id)
+        if cms_id in self.pending:
+            try:
+                self.records = fetch_alma_records(self.pending, alma_service)
+            except (AlmaRESTError, AlmaAPIError) as error:
+                msg = "Alma batch of %s failed: %s"
+                current_app.logger.warning(msg, self.pending, error)
+            self.pending = []
+        return self.records.pop(cms_id, None)
+
+
+def alma_prefetch_iter(entries: Iterable, chunk_size: int) -> Iterator:
+    """Stream entries, the alma records of each chunk are prefetched.
+
+    The prefetch is active until the consumer has exhausted or closed the
+    generator, so the records asked for by get_alma_record are taken from it.
+    """
+    prefetch = AlmaPrefetch()
+    token = _active_prefetch.set(prefetch)
+    try:
+        for chunk in batched(entries, chunk_size, strict=False):
+            prefetch.announce([str(entry.cms_id) for entry in chunk])
+            yield from chunk
+    finally:
+        try:
+            _active_prefetch.reset(token)
+        except ValueError:
+            # a stream closed from another context
+            _active_prefetch.set(None)
+
+
+def get_alma_record(cms_id: str | int, alma_service: AlmaSRUService) -> list[Element]:
+    """Get the alma record of cms_id, out of the active prefetch if possible.
+
+    A record which has not been prefetched is fetched by its own request, the
+    errors of this request are raised.
+    """
+    if (prefetch := _active_prefetch.get()) and (
+        record := prefetch.pop(cms_id, alma_service)
+    ) is not None:
+        return [record]
+
+    with rate_limit("alma"):
+        return alma_service.get_record(cms_id, SEARCH_KEY)
+
+
+def alma_absent_iter(
+    entries: Iterable,
+    chunk_size: int,
+    key: Callable[[object], str] = attrgetter("cms_id"),
+) -> Iterator:
+    """Stream the entries whose id has no record in alma yet.
+
+    The ids of a chunk are probed by one SRU request. Entries with a record
+    in alma are logged and dropped, the ids of the others are verified
+    absent until the consumer has exhausted or closed the generator, so
+    is_duplicate does not probe them again. If the request of a chunk fails
+    the entries are streamed unverified.
+    """
+    sru_service = current_alma.alma_sru_service
+    absent: set[str] = set()
+    token = _verified_absent.set(absent)
+    try:
+        for chunk in batched(entries, chunk_size, strict=False):
+            ids = [str(key(entry)) for entry in chunk]
+            try:
+                present = fetch_alma_records(ids, sru_service).keys()
+            except (AlmaRESTError, AlmaAPIError) as error:
+                current_app.logger.warning("Alma batch of %s failed: %s", ids, error)
+                yield from chunk
+                continue
+
+            for id_, entry in zip(ids, chunk, strict=True):
+                if id_ in present:
+                    current_app.logger.warning("Duplicate in alma id: %s", id_)
+                    continue
+                absent.add(id_)
+                yield entry
+    finally:
+        try:
+            _verified_absent.reset(token)
+        except ValueError:
+            # a stream closed from another context
+            _verified_absent.set(None)
+
+
+def is_duplicate(id_: str | int) -> bool:
+    """Check if alma has a record of id_.
+
+    Ids verified absent by the active alma_absent_iter are not probed again,
+    they are compared as strings, the cms_id of an entry is an int.
+    """
+    if (absent := _verified_absent.get()) and str(id_) in absent:
+        absent.discard(str(id_))
+        return False
+
+    with rate_limit("alma"):
+        return is_duplicate_in_alma(id_)
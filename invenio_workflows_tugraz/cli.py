@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024-2025 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -11,6 +11,8 @@
 from click import group
 
 from .migration_diglib_repository.cli import migration_group
+from .openaccess.cli import openaccess_group
+from .runs.cli import runs_group
 from .theses.cli import theses_group
 
 
@@ -21,3 +23,5 @@ def workflows() -> None:
 
 workflows.add_command(theses_group)
 workflows.add_command(migration_group)
+workflows.add_command(openaccess_group)
+workflows.add_command(runs_group)
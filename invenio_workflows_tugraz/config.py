@@ -24,9 +24,11 @@ from .theses import (
     theses_create_aggregator,
     theses_create_func,
     theses_duplicate_func,
+    theses_duplicate_many,
     theses_filter,
     theses_import_from_alma_func,
     theses_import_from_cms_func,
+    theses_import_from_cms_many,
     theses_update_aggregator,
     theses_update_func,
 )
@@ -59,14 +61,31 @@ WORKFLOWS_ALMA_ALMA_RECORDS_CREATE_AGGREGATORS = {
 """"""
 
 WORKFLOWS_CAMPUSONLINE_THESES_FILTER = theses_filter()
-""""""
+"""Asks for all theses, the theses import_from_cms task harvests incrementally.
+
+The import_theses_from_campusonline task of invenio-campusonline does not
+advance the mark of the harvest, so this filter stays a full one.
+"""
 
 WORKFLOWS_CAMPUSONLINE_IMPORT_FUNC = theses_import_from_cms_func
 """"""
 
+WORKFLOWS_CAMPUSONLINE_IMPORT_MANY_FUNC = theses_import_from_cms_many
+"""Import the harvested theses with prefetched metadata and files.
+
+Used by the theses import_from_cms task, the import_theses_from_campusonline
+task of invenio-campusonline imports by WORKFLOWS_CAMPUSONLINE_IMPORT_FUNC.
+"""
+
 WORKFLOWS_CAMPUSONLINE_DUPLICATE_FUNC = theses_duplicate_func
 """"""
 
+WORKFLOWS_CAMPUSONLINE_DUPLICATE_MANY_FUNC = theses_duplicate_many
+"""Get the already imported cms_ids out of the harvested ones in one call.
+
+Used by WORKFLOWS_CAMPUSONLINE_IMPORT_MANY_FUNC to skip them up front.
+"""
+
 WORKFLOWS_IMOOX_IMPORT_FUNC = imoox_import_func
 """"""
 
@@ -126,3 +145,79 @@ WORKFLOWS_MARC21_CATALOGUE_JAVASCRIPT_EXTENDABLE: list[str] = []
 WORKFLOWS_MARC21_CATALOGUE_IMPORT_CLS_TYPES: dict[str, str] = {
     "publisher": "invenio_workflows_tugraz.publisher.convert:CSVToMarc21",
 }
+
+WORKFLOWS_TUGRAZ_READY_TO_PAGE_SIZE = 500
+"""Number of workflow entries loaded per page while streaming ready to entries."""
+
+WORKFLOWS_TUGRAZ_BULK_CHUNK_SIZE = 500
+"""Maximum number of ids per UPDATE ... WHERE pid IN (...) statement."""
+
+WORKFLOWS_TUGRAZ_STATE_FLUSH_SIZE = 100
+"""Number of successful transitions collected by a task before they are written."""
+
+WORKFLOWS_TUGRAZ_CMS_STATUS_WORKERS = 1
+"""Number of concurrent campusonline calls of the status_arch/status_pub tasks."""
+
+WORKFLOWS_TUGRAZ_RATE_LIMITS: dict[str, float] = {}
+"""Allowed calls per second per external system, e.g. {"alma": 10, "cms": 5}.
+
+Known systems are "alma", "cms" and "pure", systems without an entry are not
+limited.
+"""
+
+WORKFLOWS_TUGRAZ_RATE_LIMITS_DB = None
+"""Path of the sqlite file shared by the rate limiters of one host.
+
+Defaults to workflows-rate-limits.sqlite in the instance path.
+"""
+
+WORKFLOWS_TUGRAZ_RUN_LEASE_TTL = 6 * 3600
+"""Seconds after which the lease of a chunked run is taken over.
+
+The lease is released by the last task of the run. If that task never runs,
+e.g. because a chunk failed, the next run waits for the expiry.
+"""
+
+WORKFLOWS_TUGRAZ_RETRY_MAX_ATTEMPTS = 8
+"""Failed attempts after which a theses or openaccess entry is parked."""
+
+WORKFLOWS_TUGRAZ_RETRY_BASE_DELAY = 600
+"""Seconds an entry backs off after its first failed attempt, doubled per attempt."""
+
+WORKFLOWS_TUGRAZ_RETRY_MAX_DELAY = 86400
+"""Upper bound in seconds of the backoff of an entry."""
+
+WORKFLOWS_TUGRAZ_REDIRECT_CACHE_SIZE = 4096
+"""Number of campusonline id to record id mappings cached by /theses/<pid_value>."""
+
+WORKFLOWS_TUGRAZ_REDIRECT_CACHE_TTL = 3600
+"""Seconds a cached campusonline id to record id mapping is used."""
+
+WORKFLOWS_TUGRAZ_CMS_IMPORT_PREFETCH = 4
+"""Number of theses fetched from campusonline ahead of the one being written."""
+
+WORKFLOWS_TUGRAZ_SCRATCH_DIR = None
+"""Directory of the files downloaded by the imports.
+
+Defaults to invenio-workflows-tugraz in the temporary directory.
+"""
+
+WORKFLOWS_TUGRAZ_SCRATCH_QUOTA = 10 * 1024**3
+"""Maximum bytes of the downloaded files an import holds at once, None for no limit."""
+
+WORKFLOWS_TUGRAZ_ALMA_BATCH_SIZE = 10
+"""Number of theses whose alma records are fetched or probed by one SRU request.
+
+Should not exceed the maximumRecords of the SRU responses, which is 10 by
+default at alma.
+"""
+
+WORKFLOWS_TUGRAZ_ALMA_IMPORT_WORKERS = 4
+"""Number of theses fetched from alma ahead of the one being written by import-alma."""
+
+WORKFLOWS_TUGRAZ_HARVEST_OVERLAP = 2 * 86400
+"""Seconds the campusonline harvest reaches back before the last harvest.
+
+The last harvest is the last finished one, reset it with
+`invenio workflows theses reset-harvest`.
+"""
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Registry of the external ids of the marc21 records and drafts."""
+
+from collections import defaultdict
+from threading import Lock
+
+from invenio_records_marc21 import DuplicateRecordError, current_records_marc21
+from invenio_records_marc21.services.record.types import Marc21Category
+from invenio_search import current_search_client
+from invenio_search.engine import dsl
+
+from .proxies import current_workflows_tugraz
+from .runs import WorkflowRun, active_run
+
+
+def split_category(category: str) -> tuple[str, str | None]:
+    """Split category into the marc21 tag and the subfield code.
+
+    e.g. "995.subfields.a.keyword" into ("995", "a") and "009.keyword" into
+    ("009", None).
+    """
+    parts = category.removesuffix(".keyword").split(".")
+    tag = parts[0]
+    code = parts[2] if parts[1:2] == ["subfields"] else None
+    return tag, code
+
+
+def extract_values(fields: dict, tag: str, code: str | None) -> set[str]:
+    """Extract the values of tag and code from the marc21 fields of a record."""
+    match fields.get(tag):
+        case str() as value:
+            return {value}
+        case list() as datafields:
+            return {
+                value
+                for datafield in datafields
+                for value in datafield.get("subfields", {}).get(code, [])
+            }
+        case _:
+            return set()
+
+
+def search_ids(category: str, values: list[str] | None = None) -> dict[str, str]:
+    """Scan the marc21 records and drafts for the values of category.
+
+    Return the map of the found values onto the id of their record. With
+    values only the records with one of them are scanned, by a single terms
+    query, and only the values out of values are returned.
+    """
+    marc21_service = current_records_marc21.records_service
+    indices = [
+        marc21_service.record_cls.index.search_alias,
+        marc21_service.draft_cls.index.search_alias,
+    ]
+    tag, code = split_category(category)
+
+    search = (
+        dsl.Search(using=current_search_client, index=indices)
+        .source(["id", f"metadata.fields.{tag}"])
+        .params(preserve_order=False)
+    )
+    if values is not None:
+        search = search.filter("terms", **{f"metadata.fields.{category}": values})
+
+    found = {}
+    for hit in search.scan():
+        hit_dict = hit.to_dict()
+        fields = hit_dict.get("metadata", {}).get("fields", {})
+        for value in extract_values(fields, tag, code):
+            found.setdefault(value, hit_dict.get("id"))
+
+    if values is not None:
+        found = {value: found[value] for value in values if value in found}
+    return found
+
+
+def search_values(category: str, values: list[str] | None = None) -> set[str]:
+    """Scan the marc21 records and drafts for the values of category.
+
+    With values only the records with one of them are scanned, by a single
+    terms query, and the found values out of values are returned.
+    """
+    return set(search_ids(category, values))
+
+
+class DuplicateRegistry:
+    """In memory map of the external ids known to have a record, per category.
+
+    The ids of the records created by this process and of the found
+    duplicates are kept for good. Other ids are looked up per run: the first
+    check of a category within a run is a search for the single id, the
+    second one loads all ids of the category, which answer the remaining
+    checks of the run. A harvest searches once instead of once per id, a
+    single import never scans the whole index. Ids created by other
+    processes during a run are not seen by it, the unique indexes of the
+    workflow tables reject those imports.
+    """
+
+    def __init__(self) -> None:
+        """Construct DuplicateRegistry."""
+        self._ids: dict[str, dict[str, str]] = defaultdict(dict)
+        self._runs: dict[str, tuple[WorkflowRun | None, dict[str, str] | None]] = {}
+        self._lock = Lock()
+
+    def get(self, value: str, category: str) -> str | None:
+        """Get the record id of value of category, None if it is not known."""
+        with self._lock:
+            return self._ids[category].get(value)
+
+    def add(self, value: str, category: str, id_: str) -> None:
+        """Add value of category with the id of its record."""
+        with self._lock:
+            self._ids[category][value] = id_
+
+    def lookup(self, value: str, category: str) -> str | None:
+        """Get the record id of value of category, None if there is no record."""
+        if id_ := self.get(value, category):
+            return id_
+
+        run = active_run()
+        with self._lock:
+            checked_by, ids = self._runs.get(category, (None, None))
+            if run is None or checked_by is not run:
+                self._runs[category] = (run, None)
+            elif ids is None:
+                ids = search_ids(category)
+                self._runs[category] = (run, ids)
+
+        if ids is None:
+            return search_ids(category, [value]).get(value)
+        return ids.get(value)
+
+
+def check_duplicate(value: Marc21Category) -> None:
+    """Raise DuplicateRecordError if a record with value exists.
+
+    A found duplicate is added to the registry.
+    """
+    registry = current_workflows_tugraz.duplicate_registry
+    value_, category = str(value), value.category
+
+    if id_ := registry.lookup(value_, category):
+        registry.add(value_, category, id_)
+        raise DuplicateRecordError(value=value_, category=category, id_=id_)
+
+
+def register_created(value: Marc21Category, id_: str) -> None:
+    """Add the value of the created record of id_ to the registry."""
+    current_workflows_tugraz.duplicate_registry.add(str(value), value.category, id_)
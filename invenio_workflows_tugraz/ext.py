@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2022-2025 Graz University of Technology.
+# Copyright (C) 2022-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -11,8 +11,10 @@
 from flask import Flask
 
 from . import config
+from .duplicates import DuplicateRegistry
 from .openaccess import WorkflowOpenaccessService, WorkflowOpenaccessServiceConfig
 from .theses import WorkflowThesesService, WorkflowThesesServiceConfig
+from .utils import TTLCache
 
 
 class InvenioWorkflowsTugraz:
@@ -65,3 +67,10 @@ class InvenioWorkflowsTugraz:
 
         openaccess_config = WorkflowOpenaccessServiceConfig.build(app)
         self.openaccess_service = WorkflowOpenaccessService(config=openaccess_config)
+
+        self.duplicate_registry = DuplicateRegistry()
+
+        self.redirect_cache = TTLCache(
+            maxsize=app.config["WORKFLOWS_TUGRAZ_REDIRECT_CACHE_SIZE"],
+            ttl=app.config["WORKFLOWS_TUGRAZ_REDIRECT_CACHE_TTL"],
+        )
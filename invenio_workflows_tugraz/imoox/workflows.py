@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024-2025 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it
 # and/or modify it under the terms of the MIT License; see LICENSE
@@ -19,9 +19,11 @@ from invenio_records_lom.utils import (
 )
 from marshmallow.exceptions import ValidationError
 
+from ..runs import tracked
 from .visitor import IMOOXToLOM
 
 
+@tracked
 def imoox_import_func(
     imoox_record: dict,
     identity: Identity,
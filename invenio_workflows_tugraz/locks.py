@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Cluster wide locks of the workflow runs."""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
+from threading import Lock
+from uuid import uuid4
+
+from flask import current_app
+from invenio_db import db
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.exc import IntegrityError
+
+from .runs.models import WorkflowRunLeaseMetadata
+
+_local_holders: Counter[str] = Counter()
+_local_guard = Lock()
+
+
+def lock_key(name: str) -> int:
+    """Get the signed 64 bit advisory lock key of name."""
+    digest = blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, signed=True)
+
+
+@contextmanager
+def _advisory_lock(name: str, *, shared: bool) -> Iterator[bool]:
+    """Hold the postgresql session advisory lock of name.
+
+    The lock is taken on a dedicated connection, so it is independent of the
+    transactions of db.session, which the workflows commit per entry. The
+    transaction of the lock query is committed right away, a session level
+    advisory lock survives it and the connection does not stay idle in
+    transaction for the whole run.
+    """
+    suffix = "_shared" if shared else ""
+    key = lock_key(name)
+    with db.engine.connect() as connection:
+        acquired = connection.execute(
+            text(f"SELECT pg_try_advisory_lock{suffix}(:key)"),
+            {"key": key},
+        ).scalar()
+        connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(
+                    text(f"SELECT pg_advisory_unlock{suffix}(:key)"),
+                    {"key": key},
+                )
+                connection.commit()
+
+
+@contextmanager
+def _local_lock(name: str, *, shared: bool) -> Iterator[bool]:
+    """Hold the in process lock of name, fallback for sqlite.
+
+    The lock excludes the runs of one process only, it gives no exclusion
+    between celery workers, which needs postgresql. _local_holders counts
+    the shared holders of name, -1 marks an exclusive holder.
+    """
+    with _local_guard:
+        holders = _local_holders[name]
+        acquired = holders >= 0 if shared else holders == 0
+        if acquired:
+            _local_holders[name] = holders + 1 if shared else -1
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with _local_guard:
+                _local_holders[name] = _local_holders[name] - 1 if shared else 0
+
+
+@contextmanager
+def run_lock(name: str, *, shared: bool = False) -> Iterator[bool]:
+    """Try to take the run lock of name, yield whether it has been taken.
+
+    The lock is not waited for. A run which could not take the lock should
+    return immediately, because another run is processing the same entries.
+    Shared holders, e.g. the chunks of one run, do not exclude each other but
+    keep an exclusive holder out. Only on postgresql the lock is cluster
+    wide, other databases, e.g. sqlite in the tests, lock per process.
+    """
+    if db.engine.dialect.name == "postgresql":
+        lock = _advisory_lock(name, shared=shared)
+    else:
+        lock = _local_lock(name, shared=shared)
+
+    with lock as acquired:
+        if not acquired:
+            current_app.logger.info("Run %s skipped, lock is held.", name)
+        yield acquired
+
+
+def acquire_lease(name: str, ttl: int | None = None) -> str | None:
+    """Try to take the lease of name, get its token or None if it is held.
+
+    Unlike the run lock, a lease is not bound to a connection, so a run which
+    is spread over several celery tasks stays exclusive until its last task
+    releases the lease. A lease which has not been released after ttl
+    seconds, by default WORKFLOWS_TUGRAZ_RUN_LEASE_TTL, is taken over.
+    """
+    ttl = ttl or current_app.config["WORKFLOWS_TUGRAZ_RUN_LEASE_TTL"]
+    model = WorkflowRunLeaseMetadata
+    now = datetime.now(timezone.utc)
+    token = uuid4().hex
+
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(
+                delete(model).where(model.name == name, model.expires < now),
+            )
+            connection.execute(
+                insert(model).values(
+                    name=name,
+                    token=token,
+                    expires=now + timedelta(seconds=ttl),
+                ),
+            )
+    except IntegrityError:
+        current_app.logger.info("Run %s skipped, lease is held.", name)
+        return None
+    return token
+
+
+def holds_lease(name: str, token: str) -> bool:
+    """Check if token is the unexpired lease of name."""
+    model = WorkflowRunLeaseMetadata
+    statement = select(model.name).where(
+        model.name == name,
+        model.token == token,
+        model.expires >= datetime.now(timezone.utc),
+    )
+    with db.engine.connect() as connection:
+        return connection.execute(statement).first() is not None
+
+
+def release_lease(name: str, token: str) -> None:
+    """Release the lease of name, if it is still the one of token."""
+    model = WorkflowRunLeaseMetadata
+    with db.engine.begin() as connection:
+        connection.execute(
+            delete(model).where(model.name == name, model.token == token),
+        )
+
+
+def locked_iter(name: str, entries: Iterable) -> Iterator:
+    """Stream entries while holding the run lock of name.
+
+    The lock is held until the consumer has exhausted or closed the
+    generator, so it covers the processing of every entry. If the lock is
+    held by another run nothing is yielded.
+    """
+    with run_lock(name) as acquired:
+        if acquired:
+            yield from entries
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2025 Graz University of Technology.
+# Copyright (C) 2025-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -11,16 +11,19 @@
 from flask_principal import Identity
 from invenio_alma import AlmaRESTService
 from invenio_alma.services import AlmaRESTError
-from invenio_alma.utils import is_duplicate_in_alma
 from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_records_lom import current_records_lom
 from invenio_records_marc21 import Marc21Metadata, convert_json_to_marc21xml
 from invenio_records_resources.services.records.results import RecordItem
 from sqlalchemy.orm.exc import NoResultFound
 
+from ..alma import is_duplicate
+from ..ratelimit import rate_limit
+from ..runs import tracked
 from .convert import LOM2Marc21
 
 
+@tracked
 def oer_create_in_alma_func(
     identity: Identity,
     lom_id: str,
@@ -29,7 +32,7 @@ def oer_create_in_alma_func(
     """Export OER to Alma."""
     lom_service = current_records_lom.records_service
 
-    if is_duplicate_in_alma(lom_id):
+    if is_duplicate(lom_id):
         msg = f"WARNING: duplicat in alma lom_id: {lom_id}"
         raise RuntimeWarning(msg)
 
@@ -47,7 +50,8 @@ def oer_create_in_alma_func(
     marc21_record_etree = convert_json_to_marc21xml(marc21_record.json["metadata"])
 
     try:
-        alma_service.create_record(marc21_record_etree)
+        with rate_limit("alma"):
+            alma_service.create_record(marc21_record_etree)
     except AlmaRESTError as error:
         msg = f"ERROR: alma rest error on lom_id: {lom_id}, error: {error}"
         raise RuntimeError(msg) from error
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic add retry columns for openaccess workflow."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6fcafd813909"
+down_revision = "4c136b376379"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    op.add_column(
+        "workflows_openaccess",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "workflows_openaccess",
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "workflows_openaccess",
+        sa.Column("parked", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_column("workflows_openaccess", "parked")
+    op.drop_column("workflows_openaccess", "next_attempt_at")
+    op.drop_column("workflows_openaccess", "attempts")
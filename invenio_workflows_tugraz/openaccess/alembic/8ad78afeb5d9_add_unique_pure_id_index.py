@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic add unique pure_id index for openaccess workflow."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8ad78afeb5d9"
+down_revision = "6fcafd813909"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database.
+
+    Fails if a pure_id has been imported twice, such entries have to be
+    cleaned up before.
+    """
+    op.create_index(
+        "ix_workflows_openaccess_pure_id",
+        "workflows_openaccess",
+        ["pure_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_index("ix_workflows_openaccess_pure_id", table_name="workflows_openaccess")
@@ -8,12 +8,22 @@
 
 """API for theses workflow."""
 
+from collections.abc import Iterator
+from datetime import datetime, timezone
 from typing import ClassVar
 
 from invenio_db import db
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Query
 
+from ..utils import backoff_until, keyset_paginate
 from .models import WorkflowOpenaccessMetadata
 
+READY_TO = {
+    "marked_as_exported": {"imported_in_repo": True},
+}
+"""Map a ready to state onto the filter of its predicate."""
+
 
 class WorkflowOpenaccess:
     """Workflow openaccess api."""
@@ -41,15 +51,80 @@ class WorkflowOpenaccess:
         return cls(model=model)
 
     @classmethod
-    def get_ready_to(cls, state: str) -> list[WorkflowOpenaccess]:
-        """Get ready to."""
-        if state == "marked_as_exported":
-            entries = cls.model_cls.query.filter_by(
-                imported_in_repo=True,
-            )
+    def resolve_by_pure_id(cls, pure_id: str) -> WorkflowOpenaccess | None:
+        """Get the entry of pure_id, None if there is none."""
+        model = cls.model_cls.query.filter_by(pure_id=pure_id).one_or_none()
+        return cls(model=model) if model else None
+
+    @classmethod
+    def ready_to_query(cls, state: str) -> Query | None:
+        """Get the query selecting the entries which are ready to state.
+
+        Parked entries and entries in backoff are not ready.
+        """
+        if state not in READY_TO:
+            return None
+        model = cls.model_cls
+        now = datetime.now(timezone.utc)
+        return model.query.filter_by(**READY_TO[state]).filter(
+            model.parked.is_(False),
+            or_(model.next_attempt_at.is_(None), model.next_attempt_at <= now),
+        )
+
+    @classmethod
+    def get_ready_to(
+        cls,
+        state: str,
+        limit: int | None = None,
+    ) -> list[WorkflowOpenaccess]:
+        """Get the first limit entries ready to state, all if limit is None."""
+        query = cls.ready_to_query(state)
+        if query is None:
+            return []
+        query = query.order_by(cls.model_cls.pid).limit(limit)
+        return [cls(model=entry) for entry in query.all()]
 
-            return [cls(model=entry) for entry in entries.all()]
-        return []
+    @classmethod
+    def iter_ready_to(
+        cls,
+        state: str,
+        page_size: int,
+    ) -> Iterator[WorkflowOpenaccess]:
+        """Stream the entries ready to state, keyset paginated by pid."""
+        query = cls.ready_to_query(state)
+        if query is None:
+            return
+        for entry in keyset_paginate(query, cls.model_cls.pid, page_size):
+            yield cls(model=entry)
+
+    @classmethod
+    def counts(cls) -> dict[str, int]:
+        """Get the number of entries per state with a single GROUP BY.
+
+        An entry is counted by the furthest state it has reached, parked
+        entries are counted in parked too.
+        """
+        imported = cls.model_cls.imported_in_repo
+        exported = cls.model_cls.marked_as_exported
+        parked = cls.model_cls.parked
+        query = select(imported, exported, parked, func.count()).group_by(
+            imported,
+            exported,
+            parked,
+        )
+
+        states = ["new", "imported_in_repo", "marked_as_exported", "parked"]
+        counts = dict.fromkeys(states, 0)
+        for is_imported, is_exported, is_parked, count in db.session.execute(query):
+            if is_parked:
+                counts["parked"] += count
+            if is_exported:
+                counts["marked_as_exported"] += count
+            elif is_imported:
+                counts["imported_in_repo"] += count
+            else:
+                counts["new"] += count
+        return counts
 
     @classmethod
     def create(cls, id_: str, pure_id: str) -> WorkflowOpenaccess:
@@ -70,4 +145,36 @@ class WorkflowOpenaccess:
             self.model.imported_in_repo = value
         if state == "marked_as_exported":
             self.model.marked_as_exported = value
+        self.model.attempts = 0
+        self.model.next_attempt_at = None
+        db.session.merge(self.model)
+
+    def register_failure(
+        self,
+        max_attempts: int,
+        base_delay: int,
+        max_delay: int,
+    ) -> None:
+        """Register a failed attempt to move the entry to the next state.
+
+        The entry is skipped by the ready to lookups until the backoff is
+        over, after max_attempts failed attempts it is parked.
+        """
+        self.model.attempts = (self.model.attempts or 0) + 1
+        if self.model.attempts >= max_attempts:
+            self.model.parked = True
+            self.model.next_attempt_at = None
+        else:
+            self.model.next_attempt_at = backoff_until(
+                self.model.attempts,
+                base_delay,
+                max_delay,
+            )
+        db.session.merge(self.model)
+
+    def unpark(self) -> None:
+        """Unpark the entry, the next run attempts it again."""
+        self.model.parked = False
+        self.model.attempts = 0
+        self.model.next_attempt_at = None
         db.session.merge(self.model)
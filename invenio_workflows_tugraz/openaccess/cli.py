@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""CLI for openaccess workflow."""
+
+from json import dumps
+
+from click import argument, group, secho
+from flask.cli import with_appcontext
+from invenio_access.permissions import system_identity
+
+from ..proxies import current_workflows_tugraz
+from ..types import Color
+
+
+@group("openaccess")
+def openaccess_group() -> None:
+    """Openaccess group."""
+
+
+@openaccess_group.command()
+@with_appcontext
+def stats() -> None:
+    """Show the number of entries per state as json."""
+    oa_service = current_workflows_tugraz.openaccess_service
+    secho(dumps(oa_service.counts(system_identity)), fg=Color.neutral)
+
+
+@openaccess_group.command()
+@with_appcontext
+@argument("pid")
+def unpark(pid: str) -> None:
+    """Unpark the entry of pid, the next run attempts it again."""
+    oa_service = current_workflows_tugraz.openaccess_service
+    oa_service.unpark(system_identity, pid)
+    secho(f"pid: {pid} unparked", fg=Color.success)
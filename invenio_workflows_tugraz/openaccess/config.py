@@ -12,6 +12,7 @@ from typing import ClassVar
 
 from invenio_records_resources.services.base.config import (
     ConfiguratorMixin,
+    FromConfig,
     ServiceConfig,
 )
 
@@ -22,3 +23,11 @@ class WorkflowOpenaccessServiceConfig(ServiceConfig, ConfiguratorMixin):
     """Workflow openaccess service config."""
 
     openaccess_cls: ClassVar[type[WorkflowOpenaccess]] = WorkflowOpenaccess
+
+    page_size = FromConfig("WORKFLOWS_TUGRAZ_READY_TO_PAGE_SIZE", default=500)
+
+    max_attempts = FromConfig("WORKFLOWS_TUGRAZ_RETRY_MAX_ATTEMPTS", default=8)
+
+    retry_base_delay = FromConfig("WORKFLOWS_TUGRAZ_RETRY_BASE_DELAY", default=600)
+
+    retry_max_delay = FromConfig("WORKFLOWS_TUGRAZ_RETRY_MAX_DELAY", default=86400)
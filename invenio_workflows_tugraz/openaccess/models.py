@@ -8,8 +8,10 @@
 
 """Models for theses workflow."""
 
+from datetime import datetime
+
 from invenio_db import db
-from sqlalchemy import BOOLEAN
+from sqlalchemy import BOOLEAN, false
 
 
 class WorkflowOpenaccessMetadata(db.Model, db.Timestamp):
@@ -17,6 +19,10 @@ class WorkflowOpenaccessMetadata(db.Model, db.Timestamp):
 
     __tablename__ = "workflows_openaccess"
 
+    __table_args__ = (
+        db.Index("ix_workflows_openaccess_pure_id", "pure_id", unique=True),
+    )
+
     pid: str = db.Column(db.String(255), primary_key=True)
 
     pure_id: str = db.Column(db.String(255))
@@ -24,3 +30,19 @@ class WorkflowOpenaccessMetadata(db.Model, db.Timestamp):
     imported_in_repo: bool = db.Column(BOOLEAN, default=False)
 
     marked_as_exported: bool = db.Column(BOOLEAN, default=False)
+
+    attempts: int = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
+    next_attempt_at: datetime = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    parked: bool = db.Column(
+        BOOLEAN,
+        nullable=False,
+        default=False,
+        server_default=false(),
+    )
@@ -8,6 +8,7 @@
 
 """Service for openaccess workflow."""
 
+from collections.abc import Iterator
 from typing import cast
 
 from flask_principal import Identity
@@ -30,9 +31,36 @@ class WorkflowOpenaccessService(Service):
         """Theses cls."""
         return self.config.openaccess_cls
 
-    def get_ready_to(self, _: Identity, state: str) -> list[WorkflowOpenaccess]:
-        """Get archived."""
-        return self.openaccess_cls.get_ready_to(state=state)
+    def get_ready_to(
+        self,
+        _: Identity,
+        state: str,
+        limit: int | None = None,
+    ) -> list[WorkflowOpenaccess]:
+        """Get the first limit entries ready to state, all if limit is None."""
+        return self.openaccess_cls.get_ready_to(state=state, limit=limit)
+
+    def iter_ready_to(
+        self,
+        _: Identity,
+        state: str,
+        page_size: int | None = None,
+    ) -> Iterator[WorkflowOpenaccess]:
+        """Stream the entries ready to state page by page."""
+        page_size = page_size or self.config.page_size
+        return self.openaccess_cls.iter_ready_to(state=state, page_size=page_size)
+
+    def resolve_by_pure_id(
+        self,
+        _: Identity,
+        pure_id: str,
+    ) -> WorkflowOpenaccess | None:
+        """Get the entry of pure_id, None if there is none."""
+        return self.openaccess_cls.resolve_by_pure_id(pure_id)
+
+    def counts(self, _: Identity) -> dict[str, int]:
+        """Get the number of entries per state."""
+        return self.openaccess_cls.counts()
 
     @unit_of_work()
     def create(
@@ -46,6 +74,29 @@ class WorkflowOpenaccessService(Service):
         entry = self.openaccess_cls.create(id_, pure_id)
         uow.register(RecordCommitOp(cast(Record, entry)))
 
+    @unit_of_work()
+    def register_failure(
+        self,
+        _: Identity,
+        id_: str,
+        uow: UnitOfWork,
+    ) -> None:
+        """Register a failed attempt, the entry backs off or gets parked."""
+        entry = self.openaccess_cls.resolve(id_)
+        entry.register_failure(
+            max_attempts=self.config.max_attempts,
+            base_delay=self.config.retry_base_delay,
+            max_delay=self.config.retry_max_delay,
+        )
+        uow.register(RecordCommitOp(cast(Record, entry)))
+
+    @unit_of_work()
+    def unpark(self, _: Identity, id_: str, uow: UnitOfWork) -> None:
+        """Unpark the entry."""
+        entry = self.openaccess_cls.resolve(id_)
+        entry.unpark()
+        uow.register(RecordCommitOp(cast(Record, entry)))
+
     @unit_of_work()
     def set_state(
         self,
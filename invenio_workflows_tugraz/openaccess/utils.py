@@ -8,16 +8,26 @@
 
 """Openaccess Workflow utils."""
 
+from invenio_access.permissions import system_identity
 from invenio_pure import URL
-from invenio_records_marc21 import check_about_duplicate
+from invenio_records_marc21 import DuplicateRecordError, check_about_duplicate
 
+from ..duplicates import check_duplicate
+from ..proxies import current_workflows_tugraz
 from .types import PureId
 
 
 @check_about_duplicate.register
 def _(value: PureId) -> None:
-    """Check about double pure id."""
-    check_about_duplicate(str(value), value.category)
+    """Check about double pure id, the workflow entries first."""
+    oa_service = current_workflows_tugraz.openaccess_service
+    if entry := oa_service.resolve_by_pure_id(system_identity, str(value)):
+        raise DuplicateRecordError(
+            value=str(value),
+            category=value.category,
+            id_=entry.pid,
+        )
+    check_duplicate(value)
 
 
 def access_type(electronic_version: dict[str, dict[str, str]]) -> str:
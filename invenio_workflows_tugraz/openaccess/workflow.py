@@ -8,10 +8,10 @@
 
 """Open Access Workflow."""
 
+from collections.abc import Iterator
+
 from flask_principal import Identity
 from invenio_access.permissions import system_identity
-from invenio_pidstore.errors import PIDDoesNotExistError
-from invenio_pidstore.models import PersistentIdentifier
 from invenio_pure import PureRuntimeError
 from invenio_pure.records.models import PureRESTError
 from invenio_pure.services import PureRESTService
@@ -22,13 +22,17 @@ from invenio_records_marc21 import (
     create_record,
     current_records_marc21,
 )
-from invenio_records_marc21.records import Marc21Draft, Marc21Record
 from invenio_records_resources.services.records.results import RecordItem
 from marshmallow.exceptions import ValidationError
-from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.orm.exc import StaleDataError
 
+from ..locks import locked_iter
 from ..proxies import current_workflows_tugraz
+from ..ratelimit import rate_limit
+from ..resolver import Marc21Resolution, resolve_marc21
+from ..runs import tracked, tracked_iter
+from ..workspace import DownloadWorkspace, download_workspace
+from .api import WorkflowOpenaccess
 from .convert import Pure2Marc21
 from .utils import change_to_exported, extract_files
 
@@ -40,36 +44,95 @@ def openaccess_filter() -> dict:
     }
 
 
-def openaccess_mark_as_exported_aggregator() -> list[tuple[str, str]]:
-    """Return a list of tuple[marc21, pure_id] which should be marked as exported in pure."""
+def openaccess_mark_as_exported_aggregator() -> Iterator[WorkflowOpenaccess]:
+    """Stream the openaccess entries which should be marked as exported in pure.
+
+    The run lock is held until the stream is consumed, an overlapping run
+    gets no entries.
+    """
     oa_service = current_workflows_tugraz.openaccess_service
-    return oa_service.get_ready_to(system_identity, state="imported_in_repo")
+    entries = oa_service.iter_ready_to(system_identity, state="imported_in_repo")
+    entries = tracked_iter("openaccess-mark-as-exported", entries)
+    return locked_iter("openaccess-mark-as-exported", entries)
 
 
-def openaccess_import_func(  # noqa: PLR0915
+@tracked
+def openaccess_import_func(
     identity: Identity,
     pure_id: PureID,
     pure_service: PureRESTService,
 ) -> RecordItem:
-    """Import record from pure into the repository."""
-    marc21_service = current_records_marc21.records_service
+    """Import record from pure into the repository.
+
+    The downloaded files are removed after the import, also on failure.
+    """
+    with download_workspace("openaccess") as workspace:
+        return import_from_pure(identity, pure_id, pure_service, workspace)
+
+
+def resolve_import(
+    identity: Identity,
+    pure_id: PureID,
+) -> tuple[Marc21Resolution | None, WorkflowOpenaccess | None]:
+    """Resolve the record and the openaccess entry of pure_id.
+
+    Raise RuntimeError if the entry belongs to another record than the one
+    of pure_id, before a draft is created for the import.
+    """
+    oa_service = current_workflows_tugraz.openaccess_service
+    resolution = resolve_marc21(pure_id, pid_type="pure")
+    entry = oa_service.resolve_by_pure_id(identity, pure_id)
+
+    marc_id = resolution.id if resolution else "a new record"
+    if entry and entry.pid != marc_id:
+        msg = f"ERROR: PureImport pure_id: {pure_id} belongs to {entry.pid}, not {marc_id}"
+        raise RuntimeError(msg)
+    return resolution, entry
+
+
+def register_import(
+    identity: Identity,
+    pure_id: PureID,
+    marc_id: str,
+    entry: WorkflowOpenaccess | None,
+) -> None:
+    """Register the import of marc_id, create the entry if there is none."""
     oa_service = current_workflows_tugraz.openaccess_service
+
+    if entry:
+        # if a record will be reimported after resetting the
+        # ready-to-export tag in pure. the record in pure has to be
+        # updated again, to make that happen the marked_as_exported
+        # has to be resetted
+        oa_service.set_state(
+            identity,
+            id_=marc_id,
+            state="marked_as_exported",
+            value=False,
+        )
+    else:
+        oa_service.create(identity, marc_id, pure_id)
+
+    oa_service.set_state(identity, id_=marc_id, state="imported_in_repo")
+
+
+def import_from_pure(
+    identity: Identity,
+    pure_id: PureID,
+    pure_service: PureRESTService,
+    workspace: DownloadWorkspace,
+) -> RecordItem:
+    """Import record from pure, the files are downloaded into workspace."""
+    marc21_service = current_records_marc21.records_service
     ignore_files = False
 
-    try:
-        # resolve record over pure_id
-        pid = PersistentIdentifier.get("pure", pure_id)
-        obj = pid.get_assigned_object(object_type="rec")
-
-        try:
-            draft_model = Marc21Draft.get_record(obj)
-            # the edit is not necessary, but to get a resultitem draft this is the easiest way
-            draft = marc21_service.edit(identity=identity, id_=draft_model["id"])
-        except NoResultFound:
-            record_model = Marc21Record.get_record(obj)
-            draft = marc21_service.edit(identity=identity, id_=record_model["id"])
+    # resolve record over pure_id
+    resolution, entry = resolve_import(identity, pure_id)
+    if resolution:
+        # the edit is not necessary, but to get a resultitem draft this is the easiest way
+        draft = marc21_service.edit(identity=identity, id_=resolution.id)
         ignore_files = True
-    except PIDDoesNotExistError:
+    else:
         # not found create a record
         data = {
             "files": {"enabled": True},
@@ -87,9 +150,14 @@ def openaccess_import_func(  # noqa: PLR0915
         )
 
     try:
-        pure_record = pure_service.get_metadata(identity, pure_id)
+        with rate_limit("pure"):
+            pure_record = pure_service.get_metadata(identity, pure_id)
         files = extract_files(pure_record)
-        file_paths = [pure_service.download_file(identity, file_) for file_ in files]
+        file_paths = []
+        for file_ in files:
+            with rate_limit("pure"):
+                file_path = pure_service.download_file(identity, file_)
+            file_paths.append(workspace.adopt(file_path))
     except (PureRESTError, PureRuntimeError) as error:
         # todo: delete draft
         draft.delete_draft(identity=identity, id_=draft.id)
@@ -104,7 +172,8 @@ def openaccess_import_func(  # noqa: PLR0915
         raise RuntimeError(str(error)) from error
 
     # the publisher is not included in the record information
-    publisher = pure_service.get_publisher_name(identity, pure_id)
+    with rate_limit("pure"):
+        publisher = pure_service.get_publisher_name(identity, pure_id)
     marc21_record.emplace_datafield("264..1.b", value=publisher)
 
     # TODO merge with draft.data
@@ -144,25 +213,12 @@ def openaccess_import_func(  # noqa: PLR0915
     # the publish should work without errors.
     record = marc21_service.publish(id_=draft.id, identity=identity)
 
-    try:
-        oa_service.create(identity, record.id, pure_id)
-    except IntegrityError:
-        # if a record will be reimported after resetting the
-        # ready-to-export tag in pure. the record in pure has to be
-        # updated again, to make that happen the marked_as_exported
-        # has to be resetted
-        oa_service.set_state(
-            identity,
-            id_=record.id,
-            state="marked_as_exported",
-            value=False,
-        )
-
-    oa_service.set_state(identity, id_=record.id, state="imported_in_repo")
+    register_import(identity, pure_id, record.id, entry)
 
     return record
 
 
+@tracked
 def openaccess_update_status_in_pure(
     identity: Identity,
     marc_id: str,
@@ -175,14 +231,18 @@ def openaccess_update_status_in_pure(
     try:
         # yes i know this is not nice to nicest way to get the xml record, but
         # the easiest
-        pure_record = pure_service.get_metadata(identity, pure_id)
+        with rate_limit("pure"):
+            pure_record = pure_service.get_metadata(identity, pure_id)
     except (PureRESTError, PureRuntimeError) as error:
+        oa_service.register_failure(identity, id_=marc_id)
         raise RuntimeError(str(error)) from error
 
     try:
         pure_record = change_to_exported(pure_record)
-        pure_service.mark_as_exported(identity, pure_id, pure_record)
+        with rate_limit("pure"):
+            pure_service.mark_as_exported(identity, pure_id, pure_record)
     except PureRESTError as error:
+        oa_service.register_failure(identity, id_=marc_id)
         raise RuntimeError(str(error)) from error
 
     oa_service.set_state(identity, id_=marc_id, state="marked_as_exported")
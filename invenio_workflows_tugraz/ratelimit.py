@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Client side rate limiting of the calls to external systems."""
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+from time import sleep, time
+
+from flask import current_app
+
+
+class TokenBucket:
+    """Token bucket shared by all threads and processes of one host.
+
+    The state of the buckets is kept in a sqlite database. A token is taken
+    within an exclusive transaction, so the file lock of sqlite serializes
+    the takers of all celery workers.
+    """
+
+    def __init__(self, path: Path, rate: float, capacity: float | None = None) -> None:
+        """Construct TokenBucket.
+
+        :param rate: tokens added per second, the allowed calls per second.
+        :param capacity: maximum burst, defaults to rate.
+        """
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+
+    def connect(self) -> sqlite3.Connection:
+        """Connect to the database and create the table if necessary."""
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)",
+        )
+        return connection
+
+    def take(self, name: str) -> float:
+        """Take a token, return the seconds to wait if none was available."""
+        with closing(self.connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?",
+                    (name,),
+                ).fetchone()
+
+                now = time()
+                tokens, updated = row or (self.capacity, now)
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) "
+                    "VALUES (?, ?, ?)",
+                    (name, tokens, now),
+                )
+                connection.execute("COMMIT")
+            except sqlite3.Error:
+                connection.execute("ROLLBACK")
+                raise
+        return wait
+
+    def acquire(self, name: str) -> None:
+        """Block until a token of the bucket name has been taken."""
+        while wait := self.take(name):
+            sleep(wait)
+
+
+def get_bucket(system: str) -> TokenBucket | None:
+    """Get the token bucket of system, None if system is not limited."""
+    rate = current_app.config["WORKFLOWS_TUGRAZ_RATE_LIMITS"].get(system)
+    if not rate:
+        return None
+
+    path = current_app.config["WORKFLOWS_TUGRAZ_RATE_LIMITS_DB"]
+    if not path:
+        path = Path(current_app.instance_path) / "workflows-rate-limits.sqlite"
+    return TokenBucket(Path(path), rate)
+
+
+@contextmanager
+def rate_limit(system: str) -> Iterator[None]:
+    """Wait for the quota of the external system before the wrapped call.
+
+    The quotas are configured by WORKFLOWS_TUGRAZ_RATE_LIMITS, systems without
+    a quota are not limited.
+    """
+    if bucket := get_bucket(system):
+        bucket.acquire(system)
+    yield
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Resolver of the draft and the published record of a marc21 pid."""
+
+from typing import NamedTuple
+from uuid import UUID
+
+from flask_principal import Identity
+from invenio_db import db
+from invenio_pidstore.errors import PIDDoesNotExistError
+from invenio_pidstore.models import PersistentIdentifier
+from invenio_records_marc21.proxies import current_records_marc21
+from invenio_records_marc21.records import Marc21Draft, Marc21Record
+from invenio_records_marc21.records.models import DraftMetadata, RecordMetadata
+from invenio_records_resources.services.errors import (
+    PermissionDeniedError,
+    RecordPermissionDeniedError,
+)
+from invenio_records_resources.services.records.results import RecordItem
+from sqlalchemy import and_, select
+from sqlalchemy.orm import aliased
+
+
+class Marc21Resolution(NamedTuple):
+    """Marc21 id of a pid and which of draft and record exist."""
+
+    id: str
+    has_draft: bool
+    has_record: bool
+    uuid: UUID | None = None
+
+
+def resolve_marc21(pid_value: str, pid_type: str = "marcid") -> Marc21Resolution | None:
+    """Resolve the pid to its marc21 id, by a single query.
+
+    Soft deleted drafts and records do not count. None is returned if the
+    pid, or the marcid of its object, does not exist.
+    """
+    pid = aliased(PersistentIdentifier)
+    marcid = aliased(PersistentIdentifier)
+    statement = (
+        select(
+            marcid.pid_value,
+            DraftMetadata.id.is_not(None),
+            RecordMetadata.id.is_not(None),
+            pid.object_uuid,
+        )
+        .select_from(pid)
+        .join(
+            marcid,
+            and_(
+                marcid.object_uuid == pid.object_uuid,
+                marcid.pid_type == "marcid",
+                marcid.object_type == "rec",
+            ),
+        )
+        .outerjoin(
+            DraftMetadata,
+            and_(
+                DraftMetadata.id == pid.object_uuid,
+                DraftMetadata.json.is_not(None),
+            ),
+        )
+        .outerjoin(
+            RecordMetadata,
+            and_(
+                RecordMetadata.id == pid.object_uuid,
+                RecordMetadata.json.is_not(None),
+            ),
+        )
+        .where(pid.pid_type == pid_type, pid.pid_value == str(pid_value))
+    )
+    row = db.session.execute(statement).first()
+    return Marc21Resolution(*row) if row else None
+
+
+def _get_draft(identity: Identity, uuid: UUID) -> Marc21Draft:
+    """Get the draft of uuid, if identity may read it."""
+    marc21_service = current_records_marc21.records_service
+    draft = marc21_service.draft_cls.get_record(uuid)
+    marc21_service.require_permission(identity, "read_draft", record=draft)
+    return draft
+
+
+def _get_record(identity: Identity, uuid: UUID) -> Marc21Record:
+    """Get the record of uuid, if identity may read it."""
+    marc21_service = current_records_marc21.records_service
+    record = marc21_service.record_cls.get_record(uuid)
+    try:
+        marc21_service.require_permission(identity, "read", record=record)
+    except PermissionDeniedError as error:
+        raise RecordPermissionDeniedError(action_name="read", record=record) from error
+    return record
+
+
+def require_read(identity: Identity, resolution: Marc21Resolution) -> None:
+    """Check that identity may read the draft, or the record if there is none.
+
+    The permission check of read_draft_or_record, without serializing.
+    """
+    if resolution.has_draft:
+        _get_draft(identity, resolution.uuid)
+    elif resolution.has_record:
+        _get_record(identity, resolution.uuid)
+
+
+def _read_draft(identity: Identity, uuid: UUID) -> RecordItem:
+    """Read the draft of uuid like the read_draft of the marc21 service."""
+    marc21_service = current_records_marc21.records_service
+    draft = _get_draft(identity, uuid)
+
+    errors = []
+    for component in marc21_service.components:
+        if hasattr(component, "read_draft"):
+            component.read_draft(identity, draft=draft, errors=errors)
+
+    return marc21_service.result_item(
+        marc21_service,
+        identity,
+        draft,
+        errors=errors,
+        links_tpl=marc21_service.links_item_tpl,
+        expandable_fields=marc21_service.expandable_fields,
+    )
+
+
+def _read_record(identity: Identity, uuid: UUID) -> RecordItem:
+    """Read the record of uuid like the read of the marc21 service."""
+    marc21_service = current_records_marc21.records_service
+    record = _get_record(identity, uuid)
+
+    for component in marc21_service.components:
+        if hasattr(component, "read"):
+            component.read(identity, record=record)
+
+    return marc21_service.result_item(
+        marc21_service,
+        identity,
+        record,
+        links_tpl=marc21_service.links_item_tpl,
+        expandable_fields=marc21_service.expandable_fields,
+    )
+
+
+def read_draft_or_record(identity: Identity, id_: str) -> RecordItem:
+    """Read the draft of id_, or the record if there is no draft.
+
+    The pid is resolved once and only the table of the resolution is read,
+    the read_draft and read of the marc21 service would resolve it again.
+    Raise PIDDoesNotExistError if there is neither a draft nor a record.
+    """
+    resolution = resolve_marc21(id_)
+
+    if resolution and resolution.has_draft:
+        return _read_draft(identity, resolution.uuid)
+    if resolution and resolution.has_record:
+        return _read_record(identity, resolution.uuid)
+    pid_type = "marcid"
+    raise PIDDoesNotExistError(pid_type, id_)
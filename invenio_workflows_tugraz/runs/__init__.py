@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Ledger of the workflow runs."""
+
+from .api import WorkflowRun, active_run, track_run, tracked, tracked_iter
+
+__all__ = (
+    "WorkflowRun",
+    "active_run",
+    "track_run",
+    "tracked",
+    "tracked_iter",
+)
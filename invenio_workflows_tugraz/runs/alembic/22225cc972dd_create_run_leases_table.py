@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic create table for the leases of workflow runs."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "22225cc972dd"
+down_revision = "2e235408a2e7"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    op.create_table(
+        "workflows_run_leases",
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("token", sa.String(32), nullable=False),
+        sa.Column("expires", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name", name=op.f("pk_workflows_run_leases")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_table("workflows_run_leases")
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic create branch for workflow runs."""
+
+# revision identifiers, used by Alembic.
+revision = "9b8b086ee87b"
+down_revision = None
+branch_labels = ("workflows_runs",)
+depends_on = "dbdbc1b19cf2"
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+
+
+def downgrade() -> None:
+    """Downgrade database."""
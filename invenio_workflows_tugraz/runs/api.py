@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""API for workflow runs."""
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from flask import current_app
+from invenio_db import db
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..utils import percentiles
+from .models import WorkflowRunMetadata
+
+# upper bounds in seconds of the buckets of the per item duration histogram
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_active_run: ContextVar[WorkflowRun | None] = ContextVar("active_run", default=None)
+
+
+class WorkflowRun:
+    """Run of a workflow task or import function.
+
+    The row of the run is written on a dedicated connection, so it survives
+    rollbacks of db.session by the processed items. A run which could not be
+    written is logged, the ledger never breaks the workflow.
+    """
+
+    model_cls = WorkflowRunMetadata
+
+    def __init__(self, name: str) -> None:
+        """Construct WorkflowRun."""
+        self.name = name
+        self.id = None
+        self.started = datetime.now(timezone.utc)
+        self.processed = 0
+        self.failed = 0
+        self.durations: list[float] = []
+        self.gauges: dict[str, float] = {}
+        self._lock = Lock()
+
+    @property
+    def metrics(self) -> dict:
+        """Get the histogram and percentiles of the item durations and the gauges."""
+        histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        for duration in self.durations:
+            histogram[bisect_left(HISTOGRAM_BUCKETS, duration)] += 1
+
+        labels = [str(bound) for bound in HISTOGRAM_BUCKETS] + ["+Inf"]
+        return {
+            "histogram": dict(zip(labels, histogram, strict=True)),
+            "duration_sum": sum(self.durations),
+            **percentiles(self.durations, ranks=(50, 95, 99)),
+            **self.gauges,
+        }
+
+    def start(self) -> None:
+        """Write the row of the run."""
+        statement = (
+            insert(self.model_cls)
+            .values(
+                name=self.name,
+                started=self.started,
+                processed=0,
+                failed=0,
+                metrics={},
+            )
+            .returning(self.model_cls.id)
+        )
+        try:
+            with db.engine.begin() as connection:
+                self.id = connection.execute(statement).scalar_one()
+        except SQLAlchemyError as error:
+            current_app.logger.warning("Run %s not recorded: %s", self.name, error)
+
+    def finish(self) -> None:
+        """Write the end, the counters and the metrics of the run."""
+        if self.id is None:
+            return
+
+        statement = (
+            update(self.model_cls)
+            .where(self.model_cls.id == self.id)
+            .values(
+                ended=datetime.now(timezone.utc),
+                processed=self.processed,
+                failed=self.failed,
+                metrics=self.metrics,
+            )
+        )
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(statement)
+        except SQLAlchemyError as error:
+            current_app.logger.warning("Run %s not recorded: %s", self.name, error)
+
+    def record(self, duration: float | None, *, failed: bool = False) -> None:
+        """Record a processed item, thread safe.
+
+        An item without duration is counted but not part of the histogram.
+        """
+        with self._lock:
+            self.processed += 1
+            self.failed += failed
+            if duration is not None:
+                self.durations.append(duration)
+
+    def gauge(self, name: str, value: float) -> None:
+        """Record a measurement, the run keeps the maximum per name."""
+        key = f"max_{name}"
+        with self._lock:
+            self.gauges[key] = max(self.gauges.get(key, value), value)
+
+    @contextmanager
+    def item(self) -> Iterator[None]:
+        """Record the wrapped processing of an item, an exception fails it."""
+        start = perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(perf_counter() - start, failed=True)
+            raise
+        self.record(perf_counter() - start)
+
+    @classmethod
+    def get(cls, id_: int) -> WorkflowRunMetadata | None:
+        """Get the run of id_."""
+        return db.session.get(cls.model_cls, id_)
+
+    @classmethod
+    def latest(cls, name: str | None = None, limit: int = 20) -> list:
+        """Get the latest runs, optionally only those of name."""
+        statement = select(cls.model_cls).order_by(cls.model_cls.started.desc())
+        if name:
+            statement = statement.where(cls.model_cls.name == name)
+        return db.session.execute(statement.limit(limit)).scalars().all()
+
+
+def summarize(run: WorkflowRunMetadata) -> dict:
+    """Get the run as dict, with the items per second and the error rate."""
+    summary = {
+        "id": run.id,
+        "name": run.name,
+        "started": run.started.isoformat(),
+        "ended": run.ended.isoformat() if run.ended else None,
+        "processed": run.processed,
+        "failed": run.failed,
+        "error_rate": run.failed / run.processed if run.processed else 0.0,
+        "items_per_second": None,
+    }
+    if run.ended:
+        seconds = (run.ended - run.started).total_seconds()
+        summary["items_per_second"] = run.processed / seconds if seconds else None
+    return summary
+
+
+def active_run() -> WorkflowRun | None:
+    """Get the run of the current context."""
+    return _active_run.get()
+
+
+@contextmanager
+def track_run(name: str) -> Iterator[WorkflowRun]:
+    """Track a run of name, the run is active within the context."""
+    run = WorkflowRun(name)
+    run.start()
+    token = _active_run.set(run)
+    try:
+        yield run
+    finally:
+        try:
+            _active_run.reset(token)
+        except ValueError:
+            # a stream closed from another context
+            _active_run.set(None)
+        run.finish()
+
+
+def tracked_iter(name: str, entries: Iterable) -> Iterator:
+    """Stream entries within a run of name.
+
+    The run is active until the consumer has exhausted or closed the
+    generator, so the items processed by the consumer are recorded to it.
+    """
+    with track_run(name):
+        yield from entries
+
+
+def tracked(func: Callable) -> Callable:
+    """Record each call of the decorated function as an item of the active run.
+
+    Without an active run, e.g. if the function is called by the loop of
+    another package, the call is recorded as a run of its own, named after
+    the function.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        if run := active_run():
+            with run.item():
+                return func(*args, **kwargs)
+        with track_run(func.__name__) as run, run.item():
+            return func(*args, **kwargs)
+
+    return wrapper
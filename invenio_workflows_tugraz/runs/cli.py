@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""CLI for workflow runs."""
+
+from json import dumps
+
+from click import argument, group, option, secho
+from flask.cli import with_appcontext
+
+from ..types import Color
+from .api import WorkflowRun, summarize
+
+
+@group("runs")
+def runs_group() -> None:
+    """Show the workflow runs."""
+
+
+@runs_group.command("list")
+@with_appcontext
+@option("--name", default=None, help="only the runs of name")
+@option("--limit", default=20, show_default=True)
+def list_runs(name: str | None, limit: int) -> None:
+    """List the latest runs."""
+    for run in WorkflowRun.latest(name=name, limit=limit):
+        summary = summarize(run)
+        p95 = run.metrics.get("p95")
+        color = Color.error if run.failed else Color.neutral
+        secho(
+            f"{run.id} {run.name} started: {summary['started']}, "
+            f"processed: {run.processed}, failed: {run.failed}, "
+            f"items/s: {summary['items_per_second']}, p95: {p95}",
+            fg=color,
+        )
+
+
+@runs_group.command()
+@with_appcontext
+@argument("run_id", type=int)
+def show(run_id: int) -> None:
+    """Show the run of run_id with its duration histogram as json."""
+    run = WorkflowRun.get(run_id)
+    if not run:
+        secho(f"run: {run_id} does not exist", fg=Color.error)
+        return
+    secho(dumps(summarize(run) | run.metrics, indent=2), fg=Color.neutral)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Models for workflow runs."""
+
+from invenio_db import db
+
+
+class WorkflowRunMetadata(db.Model):
+    """Ledger of the runs of the workflow tasks and import functions."""
+
+    __tablename__ = "workflows_runs"
+
+    __table_args__ = (db.Index("ix_workflows_runs_name_started", "name", "started"),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    name = db.Column(db.String(255), nullable=False)
+
+    started = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    # null while the run is still running or if it has been killed
+    ended = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    processed = db.Column(db.Integer, nullable=False, default=0)
+
+    failed = db.Column(db.Integer, nullable=False, default=0)
+
+    # histogram and percentiles of the per item durations
+    metrics = db.Column(db.JSON, nullable=False, default=dict)
+
+
+class WorkflowRunLeaseMetadata(db.Model):
+    """Lease of a run which is spread over several celery tasks."""
+
+    __tablename__ = "workflows_run_leases"
+
+    name = db.Column(db.String(255), primary_key=True)
+
+    token = db.Column(db.String(32), nullable=False)
+
+    # an expired lease is taken over by the next run
+    expires = db.Column(db.DateTime(timezone=True), nullable=False)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024-2025 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -8,8 +8,6 @@
 
 """Teachcenter workflows."""
 
-from pathlib import Path
-
 from flask_principal import Identity
 from invenio_moodle import MoodleRESTService
 from invenio_pidstore.errors import PIDDoesNotExistError
@@ -19,6 +17,8 @@ from invenio_records_lom.services import LOMRecordService
 from invenio_records_lom.utils import LOMRecordData, create_record, update_record
 from invenio_records_resources.services.records.results import RecordItem
 
+from ..runs import tracked
+from ..workspace import DownloadWorkspace, download_workspace
 from .types import BaseRecord, FileKey, FileRecord, Key, LinkKey, LinkRecord, Status
 from .visitor import TeachCenterToLOM
 
@@ -113,7 +113,8 @@ def is_duplicate(draft: RecordItem, new_course_ids: list[str]) -> bool:
     return any(id_ in existing_course_ids for id_ in new_course_ids)
 
 
-def teachcenter_import_func(  # noqa: C901
+@tracked
+def teachcenter_import_func(
     identity: Identity,
     tc_record: dict,
     moodle_service: MoodleRESTService,
@@ -125,7 +126,28 @@ def teachcenter_import_func(  # noqa: C901
     :param dict moodle_data: The data to be inserted into database,
         whose format matches `MoodleSchema`
     :param Identity identity
+
+    The downloaded file is removed after the import, also on failure.
     """
+    with download_workspace("teachcenter") as workspace:
+        return import_from_teachcenter(
+            identity,
+            tc_record,
+            moodle_service,
+            workspace,
+            dry_run=dry_run,
+        )
+
+
+def import_from_teachcenter(
+    identity: Identity,
+    tc_record: dict,
+    moodle_service: MoodleRESTService,
+    workspace: DownloadWorkspace,
+    *,
+    dry_run: bool = False,
+) -> None:
+    """Insert the teachcenter record, the file is downloaded into workspace."""
     records_service = current_records_lom.records_service
 
     record_key = create_key(tc_record)
@@ -138,7 +160,8 @@ def teachcenter_import_func(  # noqa: C901
     file_paths = []
 
     if isinstance(draft, FileRecord) and draft.status == Status.NEW:
-        file_paths += [moodle_service.download_file(identity, file_url)]
+        file_path = moodle_service.download_file(identity, file_url)
+        file_paths += [workspace.adopt(file_path)]
 
     if isinstance(draft, LinkRecord) and draft.status == Status.NEW:
         draft.data.metadata.set_location(file_url)
@@ -146,9 +169,6 @@ def teachcenter_import_func(  # noqa: C901
     if dry_run:
         if draft.status == Status.NEW:
             records_service.delete_draft(id_=draft.draft.id, identity=identity)
-        if len(file_paths):
-            for file_path in file_paths:
-                Path(file_path).unlink()
         msg = f"DRY_RUN teachcenter import success id: {record_key}"
         raise RuntimeError(msg)
 
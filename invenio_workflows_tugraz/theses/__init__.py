@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2022-2025 Graz University of Technology.
+# Copyright (C) 2022-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -14,9 +14,12 @@ from .theses import (
     theses_create_aggregator,
     theses_create_func,
     theses_duplicate_func,
+    theses_duplicate_many,
     theses_filter,
     theses_import_from_alma_func,
+    theses_import_from_alma_many,
     theses_import_from_cms_func,
+    theses_import_from_cms_many,
     theses_update_aggregator,
     theses_update_func,
 )
@@ -29,9 +32,12 @@ __all__ = (
     "theses_create_aggregator",
     "theses_create_func",
     "theses_duplicate_func",
+    "theses_duplicate_many",
     "theses_filter",
     "theses_import_from_alma_func",
+    "theses_import_from_alma_many",
     "theses_import_from_cms_func",
+    "theses_import_from_cms_many",
     "theses_update_aggregator",
     "theses_update_func",
 )
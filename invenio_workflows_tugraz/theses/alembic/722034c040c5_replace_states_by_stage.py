@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic replace state columns by a stage column for theses workflow."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "722034c040c5"
+down_revision = "dc81dfba10e0"
+branch_labels = ()
+depends_on = None
+
+
+STATES = [
+    "imported_in_repo",
+    "archived_in_cms",
+    "created_in_alma",
+    "updated_in_repo",
+    "published_in_cms",
+]
+"""The boolean columns, the position + 1 is the corresponding stage."""
+
+READY_TO_INDEXES = {
+    "ix_workflows_theses_ready_to_archive_in_cms": (
+        "imported_in_repo = true AND archived_in_cms = false"
+    ),
+    "ix_workflows_theses_ready_to_create_in_alma": (
+        "archived_in_cms = true AND created_in_alma = false"
+    ),
+    "ix_workflows_theses_ready_to_update_in_repo": (
+        "created_in_alma = true AND updated_in_repo = false"
+    ),
+    "ix_workflows_theses_ready_to_publish_in_cms": (
+        "updated_in_repo = true AND published_in_cms = false"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    op.add_column(
+        "workflows_theses",
+        sa.Column("stage", sa.SmallInteger(), nullable=False, server_default="0"),
+    )
+
+    # the furthest state wins, inconsistent combinations like published but
+    # not archived are moved to the furthest state too
+    whens = " ".join(
+        f"WHEN {state} = true THEN {stage}"
+        for stage, state in reversed(list(enumerate(STATES, start=1)))
+    )
+    sql = f"UPDATE workflows_theses SET stage = CASE {whens} ELSE 0 END"  # noqa: S608
+    op.execute(sql)
+
+    for name in READY_TO_INDEXES:
+        op.drop_index(name, table_name="workflows_theses")
+    for state in STATES:
+        op.drop_column("workflows_theses", state)
+
+    op.create_index(
+        "ix_workflows_theses_stage_pid",
+        "workflows_theses",
+        ["stage", "pid"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    for state in STATES:
+        op.add_column(
+            "workflows_theses",
+            sa.Column(state, sa.Boolean(), default=False),
+        )
+
+    sets = ", ".join(
+        f"{state} = (stage >= {stage})" for stage, state in enumerate(STATES, start=1)
+    )
+    op.execute(f"UPDATE workflows_theses SET {sets}")  # noqa: S608
+
+    op.drop_index("ix_workflows_theses_stage_pid", table_name="workflows_theses")
+    op.drop_column("workflows_theses", "stage")
+
+    for name, predicate in READY_TO_INDEXES.items():
+        op.create_index(
+            name,
+            "workflows_theses",
+            ["pid"],
+            postgresql_where=sa.text(predicate),
+            sqlite_where=sa.text(predicate),
+        )
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic add unique cms_id index for theses workflow."""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "72ccfb97aafd"
+down_revision = "5c87d18cff3a"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database.
+
+    Fails if a cms_id has been imported twice, such entries have to be
+    cleaned up before.
+    """
+    op.create_index(
+        "ix_workflows_theses_cms_id",
+        "workflows_theses",
+        ["cms_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_index("ix_workflows_theses_cms_id", table_name="workflows_theses")
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic add ready to indexes for theses workflow."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "dc81dfba10e0"
+down_revision = "eca8ae6a6bc1"
+branch_labels = ()
+depends_on = "937ba80502f3"
+
+
+READY_TO_INDEXES = {
+    "ix_workflows_theses_ready_to_archive_in_cms": (
+        "imported_in_repo = true AND archived_in_cms = false"
+    ),
+    "ix_workflows_theses_ready_to_create_in_alma": (
+        "archived_in_cms = true AND created_in_alma = false"
+    ),
+    "ix_workflows_theses_ready_to_update_in_repo": (
+        "created_in_alma = true AND updated_in_repo = false"
+    ),
+    "ix_workflows_theses_ready_to_publish_in_cms": (
+        "updated_in_repo = true AND published_in_cms = false"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    for name, predicate in READY_TO_INDEXES.items():
+        op.create_index(
+            name,
+            "workflows_theses",
+            ["pid"],
+            postgresql_where=sa.text(predicate),
+            sqlite_where=sa.text(predicate),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    for name in READY_TO_INDEXES:
+        op.drop_index(name, table_name="workflows_theses")
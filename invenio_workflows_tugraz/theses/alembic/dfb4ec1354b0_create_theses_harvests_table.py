@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic create harvests table for theses workflow."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "dfb4ec1354b0"
+down_revision = "f4893998ff24"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    op.create_table(
+        "workflows_theses_harvests",
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("harvested_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("pending_since", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("failures", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("name", name=op.f("pk_workflows_theses_harvests")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_table("workflows_theses_harvests")
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic create transitions table for theses workflow."""
+
+import sqlalchemy as sa
+from alembic import op
+from invenio_db.utils import update_table_columns_column_type_to_utc_datetime
+
+# revision identifiers, used by Alembic.
+revision = "ead9d1cd6318"
+down_revision = "722034c040c5"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    op.create_table(
+        "workflows_theses_transitions",
+        sa.Column("created", sa.DateTime(), nullable=False),
+        sa.Column("updated", sa.DateTime(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("pid", sa.String(255), nullable=False),
+        sa.Column("stage", sa.SmallInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["pid"],
+            ["workflows_theses.pid"],
+            name=op.f("fk_workflows_theses_transitions_pid_workflows_theses"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_workflows_theses_transitions")),
+    )
+    update_table_columns_column_type_to_utc_datetime(
+        "workflows_theses_transitions",
+        "created",
+    )
+    update_table_columns_column_type_to_utc_datetime(
+        "workflows_theses_transitions",
+        "updated",
+    )
+    op.create_index(
+        "ix_workflows_theses_transitions_pid_created",
+        "workflows_theses_transitions",
+        ["pid", "created"],
+    )
+    op.create_index(
+        "ix_workflows_theses_transitions_created",
+        "workflows_theses_transitions",
+        ["created"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_table("workflows_theses_transitions")
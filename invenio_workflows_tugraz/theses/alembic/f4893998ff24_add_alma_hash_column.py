@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Alembic add alma hash column for theses workflow."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f4893998ff24"
+down_revision = "72ccfb97aafd"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database."""
+    op.add_column(
+        "workflows_theses",
+        sa.Column("alma_hash", sa.String(64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database."""
+    op.drop_column("workflows_theses", "alma_hash")
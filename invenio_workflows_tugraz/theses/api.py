@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -10,9 +10,38 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date, datetime, timezone
+
 from invenio_db import db
+from sqlalchemy import Date, cast, func, insert, or_, select, update
+from sqlalchemy.orm import Query
+
+from ..utils import backoff_until, keyset_paginate
+from .models import (
+    WorkflowThesesHarvestMetadata,
+    WorkflowThesesMetadata,
+    WorkflowThesesTransitionMetadata,
+)
+from .types import ThesesStage
 
-from .models import WorkflowThesesMetadata
+READY_TO = {
+    "archive_in_cms": ThesesStage.IMPORTED_IN_REPO,
+    "create_in_alma": ThesesStage.ARCHIVED_IN_CMS,
+    "update_in_repo": ThesesStage.CREATED_IN_ALMA,
+    "publish_in_cms": ThesesStage.UPDATED_IN_REPO,
+}
+"""Map a ready to state onto the stage the entries have to be in."""
+
+STATES = {
+    "imported_in_repo": ThesesStage.IMPORTED_IN_REPO,
+    "archived_in_cms": ThesesStage.ARCHIVED_IN_CMS,
+    "created_in_alma": ThesesStage.CREATED_IN_ALMA,
+    "updated_in_repo": ThesesStage.UPDATED_IN_REPO,
+    "published_in_cms": ThesesStage.PUBLISHED_IN_CMS,
+}
+"""Map a state onto the stage an entry reaches by it."""
 
 
 class WorkflowTheses:
@@ -20,6 +49,8 @@ class WorkflowTheses:
 
     model_cls = WorkflowThesesMetadata
 
+    transition_cls = WorkflowThesesTransitionMetadata
+
     def __init__(self, model: WorkflowThesesMetadata = None) -> None:
         """Construct WorkflowTheses."""
         self.model = model
@@ -34,17 +65,39 @@ class WorkflowTheses:
         """Get cms_id."""
         return self.model.cms_id
 
+    @property
+    def stage(self) -> ThesesStage:
+        """Get stage."""
+        return ThesesStage(self.model.stage)
+
+    @property
+    def alma_hash(self) -> str | None:
+        """Get the hash of the last applied alma update."""
+        return self.model.alma_hash
+
+    def set_alma_hash(self, alma_hash: str) -> None:
+        """Set the hash of the last applied alma update."""
+        self.model.alma_hash = alma_hash
+        db.session.merge(self.model)
+
     @classmethod
     def resolve(cls, id_: str):  # noqa: ANN206
         """Get."""
         model = cls.model_cls.query.filter_by(pid=id_).one_or_none()
         return cls(model=model)
 
+    @classmethod
+    def resolve_by_cms_id(cls, cms_id: str) -> WorkflowTheses | None:
+        """Get the entry of cms_id, None if there is none."""
+        model = cls.model_cls.query.filter_by(cms_id=int(cms_id)).one_or_none()
+        return cls(model=model) if model else None
+
     @classmethod
     def create(cls, id_: str, cms_id: str):  # noqa: ANN206
         """Create."""
         with db.session.begin_nested():
-            entry = cls(model=cls.model_cls(pid=id_, cms_id=cms_id))
+            model = cls.model_cls(pid=id_, cms_id=cms_id, stage=ThesesStage.NEW)
+            entry = cls(model=model)
             db.session.add(entry.model)
         return entry
 
@@ -54,45 +107,255 @@ class WorkflowTheses:
             db.session.merge(self.model)
 
     def set_state(self, state: str) -> None:
-        """Set archived."""
-        if state == "archived_in_cms":
-            self.model.archived_in_cms = True
-        if state == "imported_in_repo":
-            self.model.imported_in_repo = True
-        if state == "created_in_alma":
-            self.model.created_in_alma = True
-        if state == "updated_in_repo":
-            self.model.updated_in_repo = True
-        if state == "published_in_cms":
-            self.model.published_in_cms = True
+        """Set state.
+
+        The stage only moves forward, a repeated earlier state, e.g. a re
+        sync of the metadata by cli, doesn't reset a later stage.
+        """
+        if state not in STATES or self.model.stage >= STATES[state]:
+            return
+        self.model.stage = STATES[state]
+        self.model.attempts = 0
+        self.model.next_attempt_at = None
         db.session.merge(self.model)
+        db.session.add(
+            self.transition_cls(pid=self.model.pid, stage=self.model.stage),
+        )
 
     @classmethod
-    def get_ready_to(cls, state: str) -> list:
-        """Get ready to."""
-        entries = []
-        if state == "archive_in_cms":
-            entries = cls.model_cls.query.filter_by(
-                imported_in_repo=True,
-                archived_in_cms=False,
-            )
+    def set_state_many(cls, ids: list[str], state: str) -> int:
+        """Set state for all entries of ids with a single UPDATE."""
+        if state not in STATES:
+            return 0
+        stage = STATES[state]
+        statement = (
+            update(cls.model_cls)
+            .where(cls.model_cls.pid.in_(ids), cls.model_cls.stage < stage)
+            .values(stage=stage, attempts=0, next_attempt_at=None)
+            .returning(cls.model_cls.pid)
+        )
+        pids = db.session.execute(statement).scalars().all()
+        if pids:
+            transitions = [{"pid": pid, "stage": stage} for pid in pids]
+            db.session.execute(insert(cls.transition_cls), transitions)
+        return len(pids)
 
-        if state == "create_in_alma":
-            entries = cls.model_cls.query.filter_by(
-                archived_in_cms=True,
-                created_in_alma=False,
-            )
+    def register_failure(
+        self,
+        max_attempts: int,
+        base_delay: int,
+        max_delay: int,
+    ) -> None:
+        """Register a failed attempt to move the entry to the next stage.
 
-        if state == "update_in_repo":
-            entries = cls.model_cls.query.filter_by(
-                created_in_alma=True,
-                updated_in_repo=False,
+        The entry is skipped by the ready to lookups until the backoff is
+        over, after max_attempts failed attempts it is parked.
+        """
+        self.model.attempts = (self.model.attempts or 0) + 1
+        if self.model.attempts >= max_attempts:
+            self.model.parked = True
+            self.model.next_attempt_at = None
+        else:
+            self.model.next_attempt_at = backoff_until(
+                self.model.attempts,
+                base_delay,
+                max_delay,
             )
+        db.session.merge(self.model)
 
-        if state == "publish_in_cms":
-            entries = cls.model_cls.query.filter_by(
-                updated_in_repo=True,
-                published_in_cms=False,
-            )
+    def unpark(self) -> None:
+        """Unpark the entry, the next run attempts it again."""
+        self.model.parked = False
+        self.model.attempts = 0
+        self.model.next_attempt_at = None
+        db.session.merge(self.model)
+
+    @classmethod
+    def ready_to_query(cls, state: str) -> Query | None:
+        """Get the query selecting the entries which are ready to state.
+
+        Parked entries and entries in backoff are not ready.
+        """
+        if state not in READY_TO:
+            return None
+        model = cls.model_cls
+        now = datetime.now(timezone.utc)
+        return model.query.filter(
+            model.stage == READY_TO[state],
+            model.parked.is_(False),
+            or_(model.next_attempt_at.is_(None), model.next_attempt_at <= now),
+        )
+
+    @classmethod
+    def get_ready_to(
+        cls,
+        state: str,
+        limit: int | None = None,
+        ids: list[str] | None = None,
+    ) -> list:
+        """Get the first limit entries ready to state, all if limit is None.
+
+        If ids is given only those of ids which are still ready to are returned.
+        """
+        query = cls.ready_to_query(state)
+        if query is None:
+            return []
+        if ids is not None:
+            query = query.filter(cls.model_cls.pid.in_(ids))
+        query = query.order_by(cls.model_cls.pid).limit(limit)
+        return [cls(model=entry) for entry in query.all()]
+
+    @classmethod
+    def iter_ready_to(cls, state: str, page_size: int) -> Iterator[WorkflowTheses]:
+        """Stream the entries ready to state, keyset paginated by pid."""
+        query = cls.ready_to_query(state)
+        if query is None:
+            return
+        for entry in keyset_paginate(query, cls.model_cls.pid, page_size):
+            yield cls(model=entry)
+
+    @classmethod
+    def known_cms_ids(cls, cms_ids: list[str]) -> set[str]:
+        """Get the cms_ids of cms_ids which have an entry already."""
+        numbers = [int(cms_id) for cms_id in cms_ids if str(cms_id).isdigit()]
+        query = select(cls.model_cls.cms_id).where(cls.model_cls.cms_id.in_(numbers))
+        return {str(cms_id) for cms_id in db.session.execute(query).scalars()}
+
+    @classmethod
+    def counts(cls) -> dict[str, int]:
+        """Get the number of entries per stage with a single GROUP BY.
+
+        Parked entries are counted in their stage and in parked.
+        """
+        stage, parked = cls.model_cls.stage, cls.model_cls.parked
+        query = select(stage, parked, func.count()).group_by(stage, parked)
+
+        counts = dict.fromkeys([stage.name.lower() for stage in ThesesStage], 0)
+        counts["parked"] = 0
+        for value, is_parked, count in db.session.execute(query):
+            counts[ThesesStage(value).name.lower()] += count
+            if is_parked:
+                counts["parked"] += count
+        return counts
+
+    @classmethod
+    def dwell_times(cls, since: datetime | None = None) -> dict[ThesesStage, list]:
+        """Get the seconds each transition took, grouped by the left stage.
+
+        The dwell time of a stage is the time between reaching it and
+        reaching the next one, entries which are still in a stage are not
+        counted.
+        """
+        transition = cls.transition_cls
+        window = {"partition_by": transition.pid, "order_by": transition.created}
+        steps = select(
+            func.lag(transition.stage).over(**window).label("left_stage"),
+            func.lag(transition.created).over(**window).label("left_at"),
+            transition.created.label("reached_at"),
+        ).subquery()
+
+        query = select(steps).where(steps.c.left_stage.is_not(None))
+        if since:
+            query = query.where(steps.c.reached_at >= since)
+
+        dwell_times: dict[ThesesStage, list] = defaultdict(list)
+        for left_stage, left_at, reached_at in db.session.execute(query):
+            seconds = (reached_at - left_at).total_seconds()
+            dwell_times[ThesesStage(left_stage)].append(seconds)
+        return dwell_times
+
+    @classmethod
+    def throughput(cls, since: datetime | None = None) -> dict[date, dict]:
+        """Get the number of entries which reached each stage per day."""
+        transition = cls.transition_cls
+        day = cast(transition.created, Date)
+        query = select(day, transition.stage, func.count()).group_by(
+            day,
+            transition.stage,
+        )
+        if since:
+            query = query.where(transition.created >= since)
+
+        throughput: dict[date, dict] = defaultdict(dict)
+        for reached_on, stage, count in db.session.execute(query.order_by(day)):
+            throughput[reached_on][ThesesStage(stage)] = count
+        return throughput
+
+
+class HarvestMark:
+    """High-water mark of a campusonline harvest.
+
+    The start of a harvest is pending until the harvest finishes, it becomes
+    the mark then. The cms_ids whose import failed are kept with the number
+    of failed attempts, they are retried by the following harvests until
+    they reach max_attempts and are parked.
+    """
+
+    model_cls = WorkflowThesesHarvestMetadata
+
+    def __init__(self, model: WorkflowThesesHarvestMetadata) -> None:
+        """Construct HarvestMark."""
+        self.model = model
+
+    @property
+    def mark(self) -> datetime | None:
+        """Get the start of the last finished harvest."""
+        return self.model.harvested_until
+
+    @property
+    def failures(self) -> dict[str, int]:
+        """Get the number of failed attempts per cms_id."""
+        return self.model.failures or {}
+
+    @classmethod
+    def resolve(cls, name: str) -> HarvestMark:
+        """Get the mark of name, a new one if there is none."""
+        model = db.session.get(cls.model_cls, name)
+        return cls(model or cls.model_cls(name=name, failures={}))
+
+    def commit(self) -> None:
+        """Commit."""
+        with db.session.begin_nested():
+            db.session.merge(self.model)
+
+    def retry_ids(self, max_attempts: int) -> list[str]:
+        """Get the cms_ids of the failed imports which are not parked."""
+        return [
+            cms_id
+            for cms_id, attempts in self.failures.items()
+            if attempts < max_attempts
+        ]
+
+    def start(self, started: datetime) -> None:
+        """Start a harvest, an unfinished one never becomes the mark."""
+        self.model.pending_since = started
+
+    def finish(self, failed: list[str], max_attempts: int) -> list[str]:
+        """Finish the pending harvest, it becomes the mark.
+
+        The failed cms_ids replace the retried ones, the parked ones are
+        kept. Return the cms_ids which are parked by this harvest.
+        """
+        failures = {
+            cms_id: attempts
+            for cms_id, attempts in self.failures.items()
+            if attempts >= max_attempts
+        }
+        for cms_id in failed:
+            failures[cms_id] = self.failures.get(cms_id, 0) + 1
+
+        if self.model.pending_since:
+            self.model.harvested_until = self.model.pending_since
+        self.model.pending_since = None
+        self.model.failures = failures
+
+        return [cms_id for cms_id in failed if failures[cms_id] == max_attempts]
+
+    def reset(self, mark: datetime | None = None) -> None:
+        """Reset the mark and drop the failures.
 
-        return [cls(model=entry) for entry in entries.all()]
+        None harvests from the configured start again.
+        """
+        self.model.harvested_until = mark
+        self.model.pending_since = None
+        self.model.failures = {}
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -8,12 +8,22 @@
 
 """CLI for theses workflow."""
 
-from click import group, secho
+from datetime import datetime, timezone
+from json import dumps
+from pathlib import Path
+
+from click import INT, STRING, DateTime, argument, group, option, secho
+from click import Path as ClickPath
 from flask.cli import with_appcontext
+from flask_principal import Identity
 from invenio_access.permissions import system_identity
+from invenio_alma import AlmaSRUService
+from invenio_alma.decorators import build_identity, build_service
 
 from ..proxies import current_workflows_tugraz
 from ..types import Color
+from .manifest import read_manifest, validate_manifest, write_result
+from .theses import theses_import_from_alma_many
 
 
 @group("theses")
@@ -26,7 +36,7 @@ def theses_group() -> None:
 def ready_to_archive() -> None:
     """Ready to archive."""
     theses_service = current_workflows_tugraz.theses_service
-    entries = theses_service.get_ready_to(system_identity, state="archive_in_cms")
+    entries = theses_service.iter_ready_to(system_identity, state="archive_in_cms")
     secho("ready to archive in cms", fg=Color.neutral)
     for entry in entries:
         secho(f"pid: {entry.pid}, cms_id: {entry.cms_id}", fg=Color.neutral)
@@ -37,7 +47,121 @@ def ready_to_archive() -> None:
 def ready_to_publish() -> None:
     """Ready to archive."""
     theses_service = current_workflows_tugraz.theses_service
-    entries = theses_service.get_ready_to(system_identity, state="publish_in_cms")
+    entries = theses_service.iter_ready_to(system_identity, state="publish_in_cms")
     secho("ready to publish in cms", fg=Color.neutral)
     for entry in entries:
         secho(f"pid: {entry.pid}, cms_id: {entry.cms_id}", fg=Color.neutral)
+
+
+@theses_group.command()
+@with_appcontext
+def stats() -> None:
+    """Show the number of entries per stage as json."""
+    theses_service = current_workflows_tugraz.theses_service
+    secho(dumps(theses_service.counts(system_identity)), fg=Color.neutral)
+
+
+@theses_group.command()
+@with_appcontext
+@argument("pid")
+def unpark(pid: str) -> None:
+    """Unpark the entry of pid, the next run attempts it again."""
+    theses_service = current_workflows_tugraz.theses_service
+    theses_service.unpark(system_identity, pid)
+    secho(f"pid: {pid} unparked", fg=Color.success)
+
+
+@theses_group.command()
+@with_appcontext
+@option("--since", type=DateTime(formats=["%Y-%m-%d"]), default=None)
+def metrics(since: datetime | None) -> None:
+    """Show the dwell time per stage and the throughput per day."""
+    if since:
+        since = since.replace(tzinfo=timezone.utc)
+    theses_service = current_workflows_tugraz.theses_service
+    stage_metrics = theses_service.stage_metrics(system_identity, since=since)
+    secho(dumps(stage_metrics, indent=2), fg=Color.neutral)
+
+
+@theses_group.command("import-alma")
+@with_appcontext
+@option(
+    "--manifest",
+    type=ClickPath(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="csv or jsonl file with ac_number, file_path, access, embargo, marcid",
+)
+@option(
+    "--results",
+    type=ClickPath(dir_okay=False, path_type=Path),
+    default=None,
+    help="jsonl result file, default is the manifest with suffix .results.jsonl",
+)
+@option("--workers", type=INT, default=None, help="parallel fetches from alma")
+@option("--search-key", type=STRING, required=True)
+@option("--domain", type=STRING, required=True)
+@option("--institution-code", type=STRING, required=True)
+@option("--user-email", type=STRING, default="alma@tugraz.at")
+@build_service
+@build_identity
+def import_alma(
+    manifest: Path,
+    results: Path | None,
+    workers: int | None,
+    identity: Identity,
+    alma_service: AlmaSRUService,
+) -> None:
+    """Import the theses of a manifest from alma.
+
+    All rows are validated before the first import. The result file can be
+    passed as manifest to resume, the imported rows are skipped then.
+    """
+    rows = list(read_manifest(manifest))
+    valid, invalid, imported = validate_manifest(rows)
+    results = results or manifest.with_suffix(".results.jsonl")
+
+    with results.open("w", encoding="utf-8") as fp:
+        for row in imported:
+            write_result(fp, row, "imported", record_id=row.get("record_id"))
+
+        for row, error in invalid:
+            secho(f"line: {row['line']}, invalid: {error}", fg=Color.warning)
+            write_result(fp, row, "invalid", error=error)
+
+        failed = 0
+        entries = theses_import_from_alma_many(identity, valid, alma_service, workers)
+        for row, result in entries:
+            if isinstance(result, RuntimeError):
+                failed += 1
+                secho(f"line: {row['line']}, error: {result}", fg=Color.error)
+                write_result(fp, row, "failed", error=str(result))
+            else:
+                secho(f"line: {row['line']}, record.id: {result.id}", fg=Color.success)
+                write_result(fp, row, "imported", record_id=result.id)
+
+    summary = {
+        "imported": len(imported) + len(valid) - failed,
+        "failed": failed,
+        "invalid": len(invalid),
+        "results": str(results),
+    }
+    secho(dumps(summary), fg=Color.neutral)
+
+
+@theses_group.command("reset-harvest")
+@with_appcontext
+@option("--name", type=STRING, default="campusonline")
+@option(
+    "--since",
+    type=DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="new mark, default is a harvest of all theses",
+)
+def reset_harvest(name: str, since: datetime | None) -> None:
+    """Reset the high-water mark and the failed imports of the harvest."""
+    if since:
+        since = since.replace(tzinfo=timezone.utc)
+    theses_service = current_workflows_tugraz.theses_service
+    previous = theses_service.harvest_mark(system_identity, name)
+    theses_service.reset_harvest(system_identity, name, mark=since)
+    secho(f"harvest: {name}, mark: {previous} -> {since}", fg=Color.success)
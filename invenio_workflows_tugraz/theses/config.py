@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -10,13 +10,26 @@
 
 from invenio_records_resources.services.base.config import (
     ConfiguratorMixin,
+    FromConfig,
     ServiceConfig,
 )
 
-from .api import WorkflowTheses
+from .api import HarvestMark, WorkflowTheses
 
 
 class WorkflowThesesServiceConfig(ServiceConfig, ConfiguratorMixin):
     """Workflow theses service config."""
 
     theses_cls = WorkflowTheses
+
+    harvest_cls = HarvestMark
+
+    page_size = FromConfig("WORKFLOWS_TUGRAZ_READY_TO_PAGE_SIZE", default=500)
+
+    bulk_chunk_size = FromConfig("WORKFLOWS_TUGRAZ_BULK_CHUNK_SIZE", default=500)
+
+    max_attempts = FromConfig("WORKFLOWS_TUGRAZ_RETRY_MAX_ATTEMPTS", default=8)
+
+    retry_base_delay = FromConfig("WORKFLOWS_TUGRAZ_RETRY_BASE_DELAY", default=600)
+
+    retry_max_delay = FromConfig("WORKFLOWS_TUGRAZ_RETRY_MAX_DELAY", default=86400)
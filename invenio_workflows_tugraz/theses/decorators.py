@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2023 Graz University of Technology.
+# Copyright (C) 2023-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -10,52 +10,114 @@
 """Decorator functions for theses views."""
 
 from collections.abc import Callable
-from functools import wraps
+from functools import partial, wraps
+from types import SimpleNamespace
 from typing import Any
 
 from flask import abort, g
-from invenio_pidstore.errors import PIDDoesNotExistError
-from invenio_records_marc21.proxies import current_records_marc21
+from flask_principal import Identity
+from invenio_access.permissions import system_identity
+from invenio_records_marc21 import current_records_marc21
+from invenio_records_resources.services.base.links import LinksTemplate
 from invenio_search import RecordsSearch
 from invenio_search.engine import dsl
-from sqlalchemy.exc import NoResultFound
 
+from ..proxies import current_workflows_tugraz
+from ..resolver import read_draft_or_record, require_read, resolve_marc21
 
-def pass_record_from_pid(f: Callable) -> Callable:
-    """Decorate a view to pass the record from a pid."""
+
+def search_record_id(pid_value: str) -> str | None:
+    """Search the id of the record of the campusonline id pid_value."""
+    record_cls = current_records_marc21.records_service.record_cls
+    search = RecordsSearch(index=record_cls.index.search_alias)
+    query = {
+        "filter": [
+            {"match_all": {}},
+            {"match_phrase": {"metadata.fields.995.subfields.a": pid_value}},
+            {"match_phrase": {"metadata.fields.995.subfields.i": "TUGRAZonline"}},
+        ],
+    }
+
+    search.query = dsl.Q("bool", **query)
+    search = search.params(size=1)
+    result = search.execute()
+    if len(result["hits"]["hits"]) == 0:
+        return None
+    return result["hits"]["hits"][0]["_source"]["id"]
+
+
+def resolve_record_id(pid_value: str) -> str | None:
+    """Get the id of the record of the campusonline id pid_value.
+
+    The workflows_theses entry of the cms_id is looked up first, the search
+    is the fallback for theses imported before the workflow existed. Found
+    ids are cached.
+    """
+    cache = current_workflows_tugraz.redirect_cache
+    if record_id := cache.get(pid_value):
+        return record_id
+
+    record_id = None
+    if pid_value.isdigit():
+        theses_service = current_workflows_tugraz.theses_service
+        entry = theses_service.resolve_by_cms_id(system_identity, pid_value)
+        record_id = entry.pid if entry else None
+
+    record_id = record_id or search_record_id(pid_value)
+    if record_id:
+        cache.set(pid_value, record_id)
+    return record_id
+
+
+def record_url(identity: Identity, record_id: str) -> str:
+    """Get the url of the upload page of the draft, or of the record.
+
+    The url is the self_html link of the marc21 service, expanded from the
+    resolution. The read permission of identity is checked like by reading
+    the draft or the record, but nothing is serialized.
+    """
+    resolution = resolve_marc21(record_id)
+    if not resolution:
+        abort(404)
+
+    require_read(identity, resolution)
+
+    marc21_service = current_records_marc21.records_service
+    links = LinksTemplate({"self_html": marc21_service.config.links_item["self_html"]})
+    record = SimpleNamespace(
+        is_draft=resolution.has_draft,
+        pid=SimpleNamespace(pid_value=record_id),
+    )
+    return links.expand(system_identity, record)["self_html"]
+
+
+def pass_record_from_pid(
+    f: Callable | None = None,
+    *,
+    light: bool = False,
+) -> Callable:
+    """Decorate a view to pass the record from a pid.
+
+    In light mode only the record_id is passed, without reading and
+    serializing the record, the view has to check the read permission, e.g.
+    by record_url.
+    """
+    if f is None:
+        return partial(pass_record_from_pid, light=light)
 
     @wraps(f)
     def view(*_: dict, **kwargs: dict) -> Any:  # noqa: ANN401
         pid_value = kwargs.get("pid_value")
 
-        search = RecordsSearch(index="marc21records")
-        query = {
-            "filter": [
-                {"match_all": {}},
-                {"match_phrase": {"metadata.fields.995.subfields.a": pid_value}},
-                {"match_phrase": {"metadata.fields.995.subfields.i": "TUGRAZonline"}},
-            ],
-        }
-
-        search.query = dsl.Q("bool", **query)
-        search = search.params(size=1)
-        result = search.execute()
-        if len(result["hits"]["hits"]) == 0:
+        record_id = resolve_record_id(pid_value)
+        if not record_id:
             abort(423)
-        hits = result["hits"]["hits"][0]["_source"]
-        hits = hits.to_dict()
-
-        try:
-            record = current_records_marc21.records_service.read_draft(
-                id_=hits["id"],
-                identity=g.identity,
-            )
-        except (PIDDoesNotExistError, NoResultFound):
-            record = current_records_marc21.records_service.read(
-                id_=hits["id"],
-                identity=g.identity,
-            )
 
+        if light:
+            kwargs["record_id"] = record_id
+            return f(**kwargs)
+
+        record = read_draft_or_record(g.identity, record_id)
         kwargs["record"] = record.to_dict()
         return f(**kwargs)
 
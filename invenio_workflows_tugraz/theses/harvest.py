@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Incremental harvest of the theses from campusonline."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_campusonline.types import ThesesFilter
+
+from ..proxies import current_workflows_tugraz
+
+HARVEST_START = datetime(2022, 11, 17, 0, 1, tzinfo=timezone.utc)
+"""Start of the theses workflow, the first harvest begins here."""
+
+
+def build_theses_filter(since: datetime = HARVEST_START) -> ThesesFilter:
+    """Build the filter of the open theses which reached IFG since since.
+
+    FILTER: xml filter to get open records
+    """
+    start_time_tag = f"<bas:from>{since.isoformat()}</bas:from>"
+    filter_ = f"""
+        <bas:thesesType>ALL</bas:thesesType>
+        <bas:state name="IFG" negate="false">{start_time_tag}</bas:state>
+        <bas:state name="PUBLISHABLE" negate="false"></bas:state>
+        <bas:state name="ARCH" negate="true"></bas:state>
+        <bas:state name="PUB" negate="true"></bas:state>
+    """
+
+    return ThesesFilter(filter_)
+
+
+def since_mark(mark: datetime | None) -> datetime:
+    """Get the time a harvest from mark asks for the theses from.
+
+    That is the mark minus WORKFLOWS_TUGRAZ_HARVEST_OVERLAP, or HARVEST_START
+    if there is no mark.
+    """
+    overlap = timedelta(seconds=current_app.config["WORKFLOWS_TUGRAZ_HARVEST_OVERLAP"])
+    return max(mark - overlap, HARVEST_START) if mark else HARVEST_START
+
+
+class Harvest:
+    """Running harvest, collects the cms_ids whose import failed."""
+
+    def __init__(self, since: datetime, retry_ids: list[str]) -> None:
+        """Construct Harvest."""
+        self.since = since
+        self.retry_ids = retry_ids
+        self.failed: list[str] = []
+
+    def fail(self, cms_id: str) -> None:
+        """Record a failed import."""
+        self.failed.append(str(cms_id))
+
+
+@contextmanager
+def run_harvest(name: str) -> Iterator[Harvest]:
+    """Run a harvest of name.
+
+    The harvest finishes if the block exits without an exception, its start
+    becomes the mark then, also if imports failed. The failed cms_ids are
+    retried by the following harvests, a cms_id which failed
+    WORKFLOWS_TUGRAZ_RETRY_MAX_ATTEMPTS times is parked and logged.
+    """
+    theses_service = current_workflows_tugraz.theses_service
+
+    started = datetime.now(timezone.utc)
+    mark = theses_service.start_harvest(system_identity, name, started)
+    retry_ids = theses_service.harvest_retry_ids(system_identity, name)
+    harvest = Harvest(since_mark(mark), retry_ids)
+    yield harvest
+
+    parked = theses_service.finish_harvest(system_identity, name, harvest.failed)
+    for cms_id in parked:
+        msg = "Harvest %s parked cms_id: %s, its import failed too often."
+        current_app.logger.error(msg, name, cms_id)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2025 Graz University of Technology.
+# Copyright (C) 2025-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -8,12 +8,73 @@
 
 """Theses jobs."""
 
-from invenio_jobs.jobs import JobType
+from typing import Any
 
-from .tasks import status_arch, status_pub
+from invenio_jobs.jobs import JobType, PredefinedArgsSchema
+from marshmallow import fields, validate
 
+from .tasks import import_from_cms, status_arch, status_pub
 
-class StatusArchJob(JobType):
+
+class StatusJobArgsSchema(PredefinedArgsSchema):
+    """Arguments of the campusonline status jobs.
+
+    Without chunk_size the whole backlog is processed by one task.
+    """
+
+    job_arg_schema = fields.String(
+        metadata={"type": "hidden"},
+        dump_default="StatusJobArgsSchema",
+        load_default="StatusJobArgsSchema",
+    )
+
+    chunk_size = fields.Integer(
+        allow_none=True,
+        load_default=None,
+        validate=validate.Range(min=1),
+        metadata={"description": "Number of theses per celery task."},
+    )
+
+    max_parallelism = fields.Integer(
+        allow_none=True,
+        load_default=None,
+        validate=validate.Range(min=1),
+        metadata={"description": "Maximum number of celery tasks of one run."},
+    )
+
+
+class ImportFromCMSJob(JobType):
+    """Import from campusonline job."""
+
+    id = "import_from_cms"
+    title = "Import Theses from Campusonline"
+    description = "Import the theses harvested from campusonline."
+
+    task = import_from_cms
+
+
+class StatusJob(JobType):
+    """Base of the campusonline status jobs."""
+
+    arguments_schema = StatusJobArgsSchema
+
+    @classmethod
+    def build_task_arguments(
+        cls,
+        job_obj: Any,  # noqa: ANN401, ARG003
+        since: str | None = None,  # noqa: ARG003
+        chunk_size: int | None = None,
+        max_parallelism: int | None = None,
+        **__: dict,
+    ) -> dict:
+        """Build the arguments of the status task from the schema fields."""
+        return {
+            "chunk_size": chunk_size,
+            "max_parallelism": max_parallelism,
+        }
+
+
+class StatusArchJob(StatusJob):
     """Status arch job."""
 
     id = "status_arch"
@@ -23,7 +84,7 @@ class StatusArchJob(JobType):
     task = status_arch
 
 
-class StatusPubJob(JobType):
+class StatusPubJob(StatusJob):
     """Status publication job."""
 
     id = "status_pub"
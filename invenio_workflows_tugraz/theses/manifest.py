@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Manifest of a bulk import of theses from alma."""
+
+from collections.abc import Iterator
+from csv import DictReader
+from json import dumps, loads
+from pathlib import Path
+from typing import TextIO
+
+from invenio_alma.utils import validate_date
+from invenio_records_marc21.services.record.types import ACNumber
+
+from ..duplicates import search_values
+
+RESULT_KEYS = ("line", "status", "record_id", "error")
+
+
+def read_manifest(path: Path) -> Iterator[dict]:
+    """Stream the rows of a csv or, by the suffix .jsonl, a jsonl manifest.
+
+    The number of the line of the row is added as "line". A result file of
+    a previous import is a jsonl manifest.
+    """
+    with path.open(encoding="utf-8") as fp:
+        if path.suffix == ".jsonl":
+            rows = (loads(line) for line in fp if line.strip())
+        else:
+            rows = DictReader(fp)
+
+        for line, row in enumerate(rows, start=1):
+            yield {**row, "line": line}
+
+
+def validate_manifest(
+    rows: list[dict],
+) -> tuple[list[dict], list[tuple[dict, str]], list[dict]]:
+    """Split rows into the rows to import, the invalid and the imported ones.
+
+    The rows are checked in one pass for an ac_number, the existence of the
+    file, the format of the embargo and duplicates, within the manifest and
+    in the repository. The duplicates in the repository are searched by one
+    terms query. Rows which have been imported by a previous run, by their
+    status in a result file, are not checked again.
+    """
+    imported = [row for row in rows if row.get("status") == "imported"]
+    rows = [row for row in rows if row.get("status") != "imported"]
+
+    ac_numbers = [row["ac_number"] for row in rows if row.get("ac_number")]
+    in_repository = set()
+    if ac_numbers:
+        in_repository = search_values(ACNumber.category, ac_numbers)
+
+    valid, invalid = [], []
+    seen = {row["ac_number"] for row in imported}
+    for row in rows:
+        ac_number = row.get("ac_number", "")
+        embargo = row.get("embargo")
+
+        if not ac_number:
+            error = "missing ac_number"
+        elif not Path(row.get("file_path") or "").is_file():
+            error = f"file not found: {row.get('file_path')}"
+        elif embargo and not validate_date(embargo):
+            error = f"embargo not YYYY-MM-DD: {embargo}"
+        elif ac_number in seen:
+            error = "duplicate in manifest"
+        elif ac_number in in_repository:
+            error = "duplicate in repository"
+        else:
+            error = None
+
+        seen.add(ac_number)
+        if error:
+            invalid.append((row, error))
+        else:
+            valid.append(row)
+
+    return valid, invalid, imported
+
+
+def write_result(fp: TextIO, row: dict, status: str, **result: str) -> None:
+    """Write the result of row as a line of a jsonl result file.
+
+    The line is a manifest row again, so the result file can be imported to
+    resume, the rows with status "imported" are skipped then.
+    """
+    data = {key: value for key, value in row.items() if key not in RESULT_KEYS}
+    fp.write(dumps({**data, "status": status, **result}) + "\n")
+    fp.flush()
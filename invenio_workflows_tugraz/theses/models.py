@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -9,7 +9,9 @@
 """Models for theses workflow."""
 
 from invenio_db import db
-from sqlalchemy import BOOLEAN
+from sqlalchemy import false
+
+from .types import ThesesStage
 
 
 class WorkflowThesesMetadata(db.Model):
@@ -17,16 +19,75 @@ class WorkflowThesesMetadata(db.Model):
 
     __tablename__ = "workflows_theses"
 
+    # stage first, so that a ready to lookup is an equality on stage which
+    # returns the rows already ordered by pid for the keyset pagination
+    __table_args__ = (
+        db.Index("ix_workflows_theses_stage_pid", "stage", "pid"),
+        db.Index("ix_workflows_theses_cms_id", "cms_id", unique=True),
+    )
+
     pid = db.Column(db.String(255), primary_key=True)
 
     cms_id = db.Column(db.Integer)
 
-    imported_in_repo = db.Column(BOOLEAN, default=False)
+    stage = db.Column(
+        db.SmallInteger,
+        nullable=False,
+        default=ThesesStage.NEW,
+        server_default="0",
+    )
+
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    next_attempt_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    parked = db.Column(
+        db.Boolean,
+        nullable=False,
+        default=False,
+        server_default=false(),
+    )
+
+    # sha256 of the metadata and access last applied by the alma update
+    alma_hash = db.Column(db.String(64), nullable=True)
+
+
+class WorkflowThesesTransitionMetadata(db.Model, db.Timestamp):
+    """Log of the stage transitions of the workflow theses.
+
+    The created timestamp is the moment the entry reached the stage.
+    """
+
+    __tablename__ = "workflows_theses_transitions"
+
+    __table_args__ = (
+        db.Index("ix_workflows_theses_transitions_pid_created", "pid", "created"),
+        db.Index("ix_workflows_theses_transitions_created", "created"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    pid = db.Column(
+        db.String(255),
+        db.ForeignKey(WorkflowThesesMetadata.pid, ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    stage = db.Column(db.SmallInteger, nullable=False)
+
+
+class WorkflowThesesHarvestMetadata(db.Model):
+    """High-water mark of a campusonline harvest."""
+
+    __tablename__ = "workflows_theses_harvests"
 
-    archived_in_cms = db.Column(BOOLEAN, default=False)
+    name = db.Column(db.String(255), primary_key=True)
 
-    created_in_alma = db.Column(BOOLEAN, default=False)
+    # start of the last finished harvest
+    harvested_until = db.Column(db.DateTime(timezone=True), nullable=True)
 
-    updated_in_repo = db.Column(BOOLEAN, default=False)
+    # start of the running harvest, it becomes the mark when it finishes
+    pending_since = db.Column(db.DateTime(timezone=True), nullable=True)
 
-    published_in_cms = db.Column(BOOLEAN, default=False)
+    # failed imports per cms_id, retried by the following harvests
+    failures = db.Column(db.JSON, nullable=False, default=dict)
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -8,6 +8,10 @@
 
 """Service for theses workflow."""
 
+from collections.abc import Iterator
+from datetime import datetime
+from itertools import batched
+
 from flask_principal import Identity
 from invenio_records_resources.services.base import Service
 from invenio_records_resources.services.uow import (
@@ -16,7 +20,8 @@ from invenio_records_resources.services.uow import (
     unit_of_work,
 )
 
-from .api import WorkflowTheses
+from ..utils import percentiles
+from .api import HarvestMark, WorkflowTheses
 
 
 class WorkflowThesesService(Service):
@@ -27,6 +32,11 @@ class WorkflowThesesService(Service):
         """Theses cls."""
         return self.config.theses_cls
 
+    @property
+    def harvest_cls(self) -> HarvestMark:
+        """Harvest cls."""
+        return self.config.harvest_cls
+
     @unit_of_work()
     def create(
         self,
@@ -52,9 +62,25 @@ class WorkflowThesesService(Service):
         entry.set_ready_to(id_, state=state)
         uow.register(RecordCommitOp(entry))
 
-    def get_ready_to(self, _: Identity, state: str) -> list[tuple[str, str]]:
-        """Get archived."""
-        return self.theses_cls.get_ready_to(state=state)
+    def get_ready_to(
+        self,
+        _: Identity,
+        state: str,
+        limit: int | None = None,
+        ids: list[str] | None = None,
+    ) -> list[WorkflowTheses]:
+        """Get the first limit entries ready to state, all if limit is None."""
+        return self.theses_cls.get_ready_to(state=state, limit=limit, ids=ids)
+
+    def iter_ready_to(
+        self,
+        _: Identity,
+        state: str,
+        page_size: int | None = None,
+    ) -> Iterator[WorkflowTheses]:
+        """Stream the entries ready to state page by page."""
+        page_size = page_size or self.config.page_size
+        return self.theses_cls.iter_ready_to(state=state, page_size=page_size)
 
     @unit_of_work()
     def set_state(
@@ -68,3 +94,151 @@ class WorkflowThesesService(Service):
         entry = self.theses_cls.resolve(id_)
         entry.set_state(state=state)
         uow.register(RecordCommitOp(entry))
+
+    @unit_of_work()
+    def set_state_many(
+        self,
+        _: Identity,
+        ids: list[str],
+        state: str,
+        uow: UnitOfWork = None,  # noqa: ARG002
+    ) -> None:
+        """Set state for all ids, one UPDATE per chunk, committed together.
+
+        The unit of work commits the session once all chunks are written.
+        """
+        for chunk in batched(ids, self.config.bulk_chunk_size, strict=False):
+            self.theses_cls.set_state_many(list(chunk), state=state)
+
+    @unit_of_work()
+    def register_failure(
+        self,
+        _: Identity,
+        id_: str,
+        uow: UnitOfWork = None,
+    ) -> None:
+        """Register a failed attempt, the entry backs off or gets parked."""
+        entry = self.theses_cls.resolve(id_)
+        entry.register_failure(
+            max_attempts=self.config.max_attempts,
+            base_delay=self.config.retry_base_delay,
+            max_delay=self.config.retry_max_delay,
+        )
+        uow.register(RecordCommitOp(entry))
+
+    @unit_of_work()
+    def unpark(self, _: Identity, id_: str, uow: UnitOfWork = None) -> None:
+        """Unpark the entry."""
+        entry = self.theses_cls.resolve(id_)
+        entry.unpark()
+        uow.register(RecordCommitOp(entry))
+
+    def alma_hash(self, _: Identity, id_: str) -> str | None:
+        """Get the hash of the last applied alma update of the entry.
+
+        A record without entry, e.g. a legacy one updated by cli, has none.
+        """
+        entry = self.theses_cls.resolve(id_)
+        return entry.alma_hash if entry.model else None
+
+    @unit_of_work()
+    def set_alma_hash(
+        self,
+        _: Identity,
+        id_: str,
+        alma_hash: str,
+        uow: UnitOfWork = None,
+    ) -> None:
+        """Set the hash of the last applied alma update of the entry, if any."""
+        entry = self.theses_cls.resolve(id_)
+        if not entry.model:
+            return
+        entry.set_alma_hash(alma_hash)
+        uow.register(RecordCommitOp(entry))
+
+    def harvest_mark(self, _: Identity, name: str) -> datetime | None:
+        """Get the high-water mark of the harvest of name."""
+        return self.harvest_cls.resolve(name).mark
+
+    @unit_of_work()
+    def start_harvest(
+        self,
+        _: Identity,
+        name: str,
+        started: datetime,
+        uow: UnitOfWork = None,
+    ) -> datetime | None:
+        """Start a harvest of name, return the mark it harvests from."""
+        harvest = self.harvest_cls.resolve(name)
+        harvest.start(started)
+        uow.register(RecordCommitOp(harvest))
+        return harvest.mark
+
+    def harvest_retry_ids(self, _: Identity, name: str) -> list[str]:
+        """Get the cms_ids of the failed imports of name which are retried."""
+        harvest = self.harvest_cls.resolve(name)
+        return harvest.retry_ids(max_attempts=self.config.max_attempts)
+
+    @unit_of_work()
+    def finish_harvest(
+        self,
+        _: Identity,
+        name: str,
+        failed: list[str],
+        uow: UnitOfWork = None,
+    ) -> list[str]:
+        """Finish the running harvest of name, its start becomes the mark.
+
+        Return the cms_ids out of failed which are parked now.
+        """
+        harvest = self.harvest_cls.resolve(name)
+        parked = harvest.finish(failed, max_attempts=self.config.max_attempts)
+        uow.register(RecordCommitOp(harvest))
+        return parked
+
+    @unit_of_work()
+    def reset_harvest(
+        self,
+        _: Identity,
+        name: str,
+        mark: datetime | None = None,
+        uow: UnitOfWork = None,
+    ) -> None:
+        """Reset the mark of the harvest of name."""
+        harvest = self.harvest_cls.resolve(name)
+        harvest.reset(mark)
+        uow.register(RecordCommitOp(harvest))
+
+    def resolve_by_cms_id(self, _: Identity, cms_id: str) -> WorkflowTheses | None:
+        """Get the entry of cms_id, None if there is none."""
+        return self.theses_cls.resolve_by_cms_id(cms_id)
+
+    def known_cms_ids(self, _: Identity, cms_ids: list[str]) -> set[str]:
+        """Get the cms_ids of cms_ids which have an entry already."""
+        return self.theses_cls.known_cms_ids(cms_ids)
+
+    def counts(self, _: Identity) -> dict[str, int]:
+        """Get the number of entries per stage."""
+        return self.theses_cls.counts()
+
+    def stage_metrics(self, _: Identity, since: datetime | None = None) -> dict:
+        """Get the dwell time percentiles per stage and the throughput per day.
+
+        The dwell times are in seconds, only transitions which happened
+        after since are considered.
+        """
+        dwell_times = self.theses_cls.dwell_times(since=since)
+        throughput = self.theses_cls.throughput(since=since)
+
+        return {
+            "dwell_times": {
+                stage.name.lower(): {"count": len(seconds), **percentiles(seconds)}
+                for stage, seconds in sorted(dwell_times.items())
+            },
+            "throughput": {
+                day.isoformat(): {
+                    stage.name.lower(): count for stage, count in sorted(counts.items())
+                }
+                for day, counts in throughput.items()
+            },
+        }
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2024 Graz University of Technology.
+# Copyright (C) 2024-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -8,60 +8,259 @@
 
 """Tasks for theses workflow."""
 
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from itertools import batched
+from math import ceil
+from time import perf_counter
+from typing import NamedTuple
 
-from celery import shared_task
+from celery import chord, group, shared_task
 from flask import current_app
 from invenio_access.permissions import system_identity
 from invenio_campusonline import current_campusonline
 
+from ..locks import acquire_lease, holds_lease, release_lease, run_lock
 from ..proxies import current_workflows_tugraz
+from ..ratelimit import rate_limit
+from ..runs import active_run, track_run
+from .harvest import build_theses_filter, run_harvest
 
 
-@shared_task(ignore_result=True)
-def status_arch() -> None:
-    """Set status to ARCH (archived)."""
+class CMSStatus(NamedTuple):
+    """Campusonline status update of the theses pipeline."""
+
+    ready_to: str
+    status: str
+    state: str
+    success_msg: str
+    error_msg: str
+
+
+CMS_STATUS = {
+    "archive": CMSStatus(
+        ready_to="archive_in_cms",
+        status="ARCHIVED",
+        state="archived_in_cms",
+        success_msg="Theses %s has been archived successfully.",
+        error_msg="Theses %s have been produced error %s on archiving.",
+    ),
+    "publish": CMSStatus(
+        ready_to="publish_in_cms",
+        status="PUBLISHED",
+        state="published_in_cms",
+        success_msg="Theses %s has been published successfully.",
+        error_msg="Theses %s have been produced error %s on publishing.",
+    ),
+}
+
+
+def set_status_in_cms(entries: Iterable, cms_status: CMSStatus) -> dict:
+    """Set status in campusonline for every entry.
+
+    The entries are processed in windows of WORKFLOWS_TUGRAZ_STATE_FLUSH_SIZE.
+    The http calls of a window run concurrently on a pool of
+    WORKFLOWS_TUGRAZ_CMS_STATUS_WORKERS threads, while logging and the
+    database stay on this thread, which writes the successful transitions of
+    each window with one UPDATE. The duration of each call is recorded to the
+    active run.
+
+    Return a summary with the number of succeeded and the failed cms ids.
+    """
     today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    flush_size = current_app.config["WORKFLOWS_TUGRAZ_STATE_FLUSH_SIZE"]
+    workers = current_app.config["WORKFLOWS_TUGRAZ_CMS_STATUS_WORKERS"]
+    app = current_app._get_current_object()  # noqa: SLF001
 
     theses_service = current_workflows_tugraz.theses_service
     cms_service = current_campusonline.campusonline_rest_service
+    summary = {"succeeded": 0, "failed": []}
+    run = active_run()
 
-    entries = theses_service.get_ready_to(system_identity, state="archive_in_cms")
+    def set_status(cms_id: str) -> float:
+        with app.app_context(), rate_limit("cms"):
+            start = perf_counter()
+            cms_service.set_status(system_identity, cms_id, cms_status.status, today)
+            return perf_counter() - start
 
-    for entry in entries:
-        cms_id = entry.cms_id
-        pid = entry.pid
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for window in batched(entries, flush_size, strict=False):
+            futures = {
+                executor.submit(set_status, entry.cms_id): entry for entry in window
+            }
+            succeeded, failed = [], []
 
-        try:
-            cms_service.set_status(system_identity, cms_id, "ARCHIVED", today)
-            theses_service.set_state(system_identity, pid, state="archived_in_cms")
+            try:
+                for future in as_completed(futures):
+                    cms_id = futures[future].cms_id
 
-            msg = "Theses %s has been archived successfully."
-            current_app.logger.info(msg, cms_id)
-        except RuntimeError as e:
-            msg = "Theses %s have been produced error %s on archiving."
-            current_app.logger.error(msg, cms_id, str(e))
+                    try:
+                        duration = future.result()
+                        succeeded.append(futures[future].pid)
+                        current_app.logger.info(cms_status.success_msg, cms_id)
+                        if run:
+                            run.record(duration)
+                    except RuntimeError as e:
+                        failed.append(futures[future].pid)
+                        if run:
+                            run.record(None, failed=True)
+                        summary["failed"].append(cms_id)
+                        current_app.logger.error(cms_status.error_msg, cms_id, str(e))
+            finally:
+                for pid in failed:
+                    theses_service.register_failure(system_identity, id_=pid)
+                if succeeded:
+                    theses_service.set_state_many(
+                        system_identity,
+                        succeeded,
+                        state=cms_status.state,
+                    )
+                    summary["succeeded"] += len(succeeded)
 
+    return summary
 
-@shared_task(ignore_result=True)
-def status_pub() -> None:
-    """Set status to PUB (published)."""
-    today = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
 
+def split_into_chunks(
+    pids: list[str],
+    chunk_size: int,
+    max_parallelism: int | None = None,
+) -> list[list[str]]:
+    """Split pids into chunks of chunk_size.
+
+    If that would result in more than max_parallelism chunks, the chunks are
+    enlarged so that there are exactly max_parallelism of them.
+    """
+    if max_parallelism:
+        chunk_size = max(chunk_size, ceil(len(pids) / max_parallelism))
+    return [list(chunk) for chunk in batched(pids, chunk_size, strict=False)]
+
+
+def run_status_in_cms(
+    name: str,
+    chunk_size: int | None = None,
+    max_parallelism: int | None = None,
+) -> None:
+    """Set status in campusonline for all entries which are ready.
+
+    Without chunk_size the whole backlog is processed by this task, otherwise
+    the backlog is split and the chunks are dispatched as a chord over the
+    workers, with status_in_cms_summary as callback.
+
+    A run returns immediately if another run of name holds the lease. The
+    lease of a chunked run is handed over to the chord, the chunks work only
+    while it is theirs and status_in_cms_summary releases it, so the run
+    stays exclusive until its last chunk has finished.
+    """
+    lease = f"theses-status-{name}"
+    if not (token := acquire_lease(lease)):
+        return
+
+    dispatched = False
+    try:
+        cms_status = CMS_STATUS[name]
+        theses_service = current_workflows_tugraz.theses_service
+        entries = theses_service.iter_ready_to(
+            system_identity,
+            state=cms_status.ready_to,
+        )
+
+        if not chunk_size:
+            with track_run(f"theses-status-{name}"):
+                set_status_in_cms(entries, cms_status)
+            return
+
+        if pids := [entry.pid for entry in entries]:
+            chunks = split_into_chunks(pids, chunk_size, max_parallelism)
+            header = group(
+                status_in_cms_chunk.s(name, chunk, token) for chunk in chunks
+            )
+            chord(header)(status_in_cms_summary.s(name, token))
+            dispatched = True
+    finally:
+        if not dispatched:
+            release_lease(lease, token)
+
+
+@shared_task
+def status_in_cms_chunk(name: str, pids: list[str], token: str) -> dict:
+    """Set status in campusonline for the entries of pids which are still ready.
+
+    A chunk works only while token is the lease of the run, a chunk whose
+    lease expired and has been taken over by a new run does nothing.
+    """
+    if not holds_lease(f"theses-status-{name}", token):
+        current_app.logger.warning("Theses status %s chunk skipped, lease lost.", name)
+        return {"succeeded": 0, "failed": []}
+
+    cms_status = CMS_STATUS[name]
     theses_service = current_workflows_tugraz.theses_service
+    entries = theses_service.get_ready_to(
+        system_identity,
+        state=cms_status.ready_to,
+        ids=pids,
+    )
+    with track_run(f"theses-status-{name}"):
+        return set_status_in_cms(entries, cms_status)
+
+
+@shared_task(ignore_result=True)
+def status_in_cms_summary(summaries: list[dict], name: str, token: str) -> None:
+    """Log the summary of all chunks of a campusonline status update.
+
+    The lease of the run is released, the next run may start.
+    """
+    release_lease(f"theses-status-{name}", token)
+
+    succeeded = sum(summary["succeeded"] for summary in summaries)
+    failed = [cms_id for summary in summaries for cms_id in summary["failed"]]
+
+    msg = "Theses status %s: %s chunks, %s succeeded, %s failed %s"
+    current_app.logger.info(msg, name, len(summaries), succeeded, len(failed), failed)
+
+
+@shared_task(ignore_result=True)
+def import_from_cms(name: str = "campusonline") -> None:
+    """Import the theses harvested from campusonline since the last harvest.
+
+    The harvested ids and the failed ones of the previous harvests are
+    imported by WORKFLOWS_CAMPUSONLINE_IMPORT_MANY_FUNC, which skips the
+    already imported ones up front and prefetches metadata and files. The
+    harvest is started before the ids are fetched and finished after the
+    last import, the failed ids are retried by the next harvest. A run
+    returns immediately if another run holds the run lock.
+    """
+    import_many = current_app.config["CAMPUSONLINE_IMPORT_MANY_FUNC"]
     cms_service = current_campusonline.campusonline_rest_service
-    entries = theses_service.get_ready_to(system_identity, state="publish_in_cms")
 
-    for entry in entries:
-        cms_id = entry.cms_id
-        pid = entry.pid
+    with run_lock(f"theses-harvest-{name}") as acquired:
+        if not acquired:
+            return
+
+        with run_harvest(name) as harvest:
+            theses_filter = build_theses_filter(harvest.since)
+            ids = cms_service.fetch_all_ids(system_identity, theses_filter)
+            ids = list(dict.fromkeys([*harvest.retry_ids, *map(str, ids)]))
+            for cms_id, result in import_many(system_identity, ids, cms_service):
+                if isinstance(result, RuntimeError):
+                    harvest.fail(cms_id)
+                    msg = "ERROR campusonline cms_id: %s couldn't be imported because of %s"
+                    current_app.logger.error(msg, cms_id, str(result))
+
+
+@shared_task(ignore_result=True)
+def status_arch(
+    chunk_size: int | None = None,
+    max_parallelism: int | None = None,
+) -> None:
+    """Set status to ARCH (archived)."""
+    run_status_in_cms("archive", chunk_size, max_parallelism)
 
-        try:
-            cms_service.set_status(system_identity, cms_id, "PUBLISHED", today)
-            theses_service.set_state(system_identity, pid, state="published_in_cms")
 
-            msg = "Theses %s has been published successfully."
-            current_app.logger.info(msg, cms_id)
-        except RuntimeError as e:
-            msg = "Theses %s have been produced error %s on publishing."
-            current_app.logger.error(msg, cms_id, str(e))
+@shared_task(ignore_result=True)
+def status_pub(
+    chunk_size: int | None = None,
+    max_parallelism: int | None = None,
+) -> None:
+    """Set status to PUB (published)."""
+    run_status_in_cms("publish", chunk_size, max_parallelism)
@@ -8,18 +8,26 @@
 
 """Theses Workflows."""
 
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+from threading import local
 from typing import NamedTuple
+from xml.etree.ElementTree import Element
 
+from flask import current_app
 from flask_principal import Identity
 from invenio_access.permissions import system_identity
 from invenio_alma import AlmaRESTService, AlmaSRUService
 from invenio_alma.services import AlmaAPIError, AlmaRESTError
-from invenio_alma.utils import is_duplicate_in_alma, validate_date
+from invenio_alma.utils import validate_date
 from invenio_campusonline import CampusOnlineRESTService
 from invenio_campusonline.records.models import CampusOnlineRESTError
 from invenio_campusonline.types import CampusOnlineID, ThesesFilter
 from invenio_campusonline.utils import extract_embargo_range
+from invenio_db import db
 from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_records_marc21 import (
     DuplicateRecordError,
@@ -35,10 +43,26 @@ from invenio_records_marc21.services.record.types import ACNumber
 from invenio_records_resources.services.records.results import RecordItem
 from marshmallow.exceptions import ValidationError
 from opensearchpy.exceptions import RequestError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.exc import NoResultFound, StaleDataError
 
+from ..alma import (
+    alma_absent_iter,
+    alma_prefetch_iter,
+    get_alma_record,
+    is_duplicate,
+)
+from ..duplicates import check_duplicate, register_created, search_values
+from ..locks import locked_iter
 from ..proxies import current_workflows_tugraz
+from ..ratelimit import rate_limit
+from ..resolver import read_draft_or_record
+from ..runs import track_run, tracked, tracked_iter
+from ..utils import content_hash
+from ..workspace import download_workspace
+from .api import WorkflowTheses
 from .convert import CampusOnlineToMarc21
+from .harvest import build_theses_filter
 from .types import CampusOnlineId
 
 error_record = NamedTuple("ErrorRecord", ["id"])
@@ -46,8 +70,15 @@ error_record = NamedTuple("ErrorRecord", ["id"])
 
 @check_about_duplicate.register
 def _(value: CampusOnlineId) -> None:
-    """Check about double campus online id."""
-    check_about_duplicate(str(value), value.category)
+    """Check about double campus online id, the workflow entries first."""
+    theses_service = current_workflows_tugraz.theses_service
+    if entry := theses_service.resolve_by_cms_id(system_identity, str(value)):
+        raise DuplicateRecordError(
+            value=str(value),
+            category=value.category,
+            id_=entry.pid,
+        )
+    check_duplicate(value)
 
 
 def theses_filter() -> ThesesFilter:
@@ -56,67 +87,71 @@ def theses_filter() -> ThesesFilter:
     FILTER: xml filter to get open records
     return ThesesFilter
     """
-    start_time_tag = "<bas:from>2022-11-17T00:01:00+00:00</bas:from>"
-    filter_ = f"""
-        <bas:thesesType>ALL</bas:thesesType>
-        <bas:state name="IFG" negate="false">{start_time_tag}</bas:state>
-        <bas:state name="PUBLISHABLE" negate="false"></bas:state>
-        <bas:state name="ARCH" negate="true"></bas:state>
-        <bas:state name="PUB" negate="true"></bas:state>
-    """
+    return build_theses_filter()
 
-    return ThesesFilter(filter_)
 
+def theses_create_aggregator() -> Iterator[WorkflowTheses]:
+    """Stream the theses entries which should be created in alma.
 
-def theses_create_aggregator() -> list[tuple[str, str]]:
-    """Return list of marc21,cmsid tuple which should be created in alma."""
+    The run lock is held until the stream is consumed, an overlapping run
+    gets no entries. The entries are probed chunk wise for duplicates in
+    alma, only those without a record in alma are streamed.
+    """
     theses_service = current_workflows_tugraz.theses_service
-    return theses_service.get_ready_to(system_identity, state="create_in_alma")
+    chunk_size = current_app.config["WORKFLOWS_TUGRAZ_ALMA_BATCH_SIZE"]
+    entries = theses_service.iter_ready_to(system_identity, state="create_in_alma")
+    entries = alma_absent_iter(entries, chunk_size)
+    entries = tracked_iter("theses-create-in-alma", entries)
+    return locked_iter("theses-create-in-alma", entries)
 
 
-def theses_update_aggregator() -> list[tuple[str, str]]:
-    """Return a list of tuple(marc21, cms_id) which should be updated in repo."""
+def theses_update_aggregator() -> Iterator[WorkflowTheses]:
+    """Stream the theses entries which should be updated in repo.
+
+    The run lock is held until the stream is consumed, an overlapping run
+    gets no entries. The alma records of the entries are fetched chunk wise,
+    theses_update_func takes them from the prefetched chunk.
+    """
     theses_service = current_workflows_tugraz.theses_service
-    return theses_service.get_ready_to(system_identity, state="update_in_repo")
+    chunk_size = current_app.config["WORKFLOWS_TUGRAZ_ALMA_BATCH_SIZE"]
+    entries = theses_service.iter_ready_to(system_identity, state="update_in_repo")
+    entries = alma_prefetch_iter(entries, chunk_size)
+    entries = tracked_iter("theses-update-in-repo", entries)
+    return locked_iter("theses-update-in-repo", entries)
 
 
-def theses_import_from_alma_func(
+def fetch_from_alma(ac_number: str, alma_service: AlmaSRUService) -> Element:
+    """Fetch the metadata of the thesis of ac_number from alma."""
+    try:
+        with rate_limit("alma"):
+            records = alma_service.get_record(ac_number)
+    except AlmaRESTError as error:
+        msg = f"ERROR: alma rest search_value: {ac_number}, error: {error}"
+        raise RuntimeError(msg) from error
+
+    if not records:
+        msg = f"ERROR: no alma record search_value: {ac_number}"
+        raise RuntimeError(msg)
+
+    return records[0]
+
+
+def create_from_alma(
     identity: Identity,
     ac_number: str,
+    metadata: Element,
     file_path: str,
     access: str,
-    embargo: str | None = None,  # change: str|None after end python3.9 support
+    *,
+    embargo: str | None = None,
     marcid: str | None = None,
-    alma_service: AlmaSRUService | None = None,
-    **_: dict,
-) -> None:
-    """Process a single import by cli of a alma record by ac number.
+) -> RecordItem:
+    """Create and publish the record of the fetched alma metadata.
 
-    Embargo has to be YYYY-MM-DD
+    The record gets the pid marcid if given, a new one otherwise.
     """
-    if not alma_service:
-        msg = "ERROR: alma_service for import_from_alma_func not set."
-        raise RuntimeError(msg)
     marc21_service = current_records_marc21.records_service
 
-    if marcid:
-        MarcDraftProvider.predefined_pid_value = marcid
-
-    if embargo and not validate_date(embargo):
-        msg = f"NotValidEmbargo search_value: {ac_number}, embargo: {embargo}"
-        raise RuntimeError(msg)
-
-    try:
-        check_about_duplicate(ACNumber(ac_number))
-    except DuplicateRecordError as error:
-        raise RuntimeError(str(error)) from error
-
-    try:
-        metadata = alma_service.get_record(ac_number)[0]
-    except AlmaRESTError as error:
-        msg = f"ERROR: alma rest search_value: {ac_number}, error: {error}"
-        raise RuntimeError(msg) from error
-
     marc21_record = Marc21Metadata(json=convert_marc21xml_to_json(metadata))
 
     data = marc21_record.json
@@ -136,6 +171,9 @@ def theses_import_from_alma_func(
             "reason": None,
         }
 
+    # the predefined pid is a class attribute, it has to be reset for the
+    # following imports
+    MarcDraftProvider.predefined_pid_value = marcid or ""
     try:
         record = create_record(marc21_service, data, [file_path], identity)
     except StaleDataError as error:
@@ -144,31 +182,160 @@ def theses_import_from_alma_func(
     except ValidationError as error:
         msg = f"ValidationError   search_value: {ac_number}, error: {error}"
         raise RuntimeError(msg) from error
+    finally:
+        MarcDraftProvider.predefined_pid_value = ""
 
+    register_created(ACNumber(ac_number), record.id)
     return record
 
 
-def theses_import_from_cms_func(
+@tracked
+def theses_import_from_alma_func(
     identity: Identity,
-    cms_id: CampusOnlineID,
-    cms_service: CampusOnlineRESTService,
-) -> RecordItem:
-    """Import the record into the repository from campusonline."""
-    marc21_service = current_records_marc21.records_service
-    theses_service = current_workflows_tugraz.theses_service
+    ac_number: str,
+    file_path: str,
+    access: str,
+    embargo: str | None = None,  # change: str|None after end python3.9 support
+    marcid: str | None = None,
+    alma_service: AlmaSRUService | None = None,
+    **_: dict,
+) -> None:
+    """Process a single import by cli of a alma record by ac number.
+
+    Embargo has to be YYYY-MM-DD
+    """
+    if not alma_service:
+        msg = "ERROR: alma_service for import_from_alma_func not set."
+        raise RuntimeError(msg)
+
+    if embargo and not validate_date(embargo):
+        msg = f"NotValidEmbargo search_value: {ac_number}, embargo: {embargo}"
+        raise RuntimeError(msg)
 
     try:
-        check_about_duplicate(CampusOnlineId(cms_id))
+        check_duplicate(ACNumber(ac_number))
     except DuplicateRecordError as error:
         raise RuntimeError(str(error)) from error
 
+    metadata = fetch_from_alma(ac_number, alma_service)
+    return create_from_alma(
+        identity,
+        ac_number,
+        metadata,
+        file_path,
+        access,
+        embargo=embargo,
+        marcid=marcid,
+    )
+
+
+def theses_import_from_alma_many(
+    identity: Identity,
+    rows: Iterable[dict],
+    alma_service: AlmaSRUService,
+    workers: int | None = None,
+) -> Iterator[tuple[dict, RecordItem | RuntimeError]]:
+    """Import the theses of the validated manifest rows, yield the result per row.
+
+    The alma metadata of the next workers rows is fetched on a thread pool
+    while the current one is written. The urls of an AlmaSRUService keep the
+    search value of the last call, so every worker thread fetches with its
+    own service built from the config of alma_service.
+
+    The writes stay on the calling thread, one after the other, so the db
+    session is not shared. Each row is committed by the records service when
+    it is created, a failed row does not roll back the rows before it. Any
+    error of a row is yielded as RuntimeError, the following rows are
+    imported anyway.
+    """
+    workers = workers or current_app.config["WORKFLOWS_TUGRAZ_ALMA_IMPORT_WORKERS"]
+    app = current_app._get_current_object()  # noqa: SLF001
+    worker = local()
+    rows = iter(rows)
+
+    with (
+        track_run("theses-import-from-alma") as run,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+
+        def fetch(row: dict) -> Element:
+            if not hasattr(worker, "alma_service"):
+                worker.alma_service = AlmaSRUService(config=alma_service.config)
+            with app.app_context():
+                return fetch_from_alma(row["ac_number"], worker.alma_service)
+
+        pending = deque(
+            (row, executor.submit(fetch, row)) for row in islice(rows, workers)
+        )
+
+        try:
+            while pending:
+                row, future = pending.popleft()
+                if (next_row := next(rows, None)) is not None:
+                    pending.append((next_row, executor.submit(fetch, next_row)))
+
+                try:
+                    with run.item():
+                        record = create_from_alma(
+                            identity,
+                            row["ac_number"],
+                            future.result(),
+                            row["file_path"],
+                            row.get("access", ""),
+                            embargo=row.get("embargo") or None,
+                            marcid=row.get("marcid") or None,
+                        )
+                except RuntimeError as error:
+                    yield row, error
+                except Exception as error:
+                    # an unexpected error of one row should not stop a backfill
+                    db.session.rollback()
+                    current_app.logger.exception(
+                        "Import of %s failed",
+                        row["ac_number"],
+                    )
+                    msg = f"ERROR: {type(error).__name__} search_value: {row['ac_number']}, error: {error}"
+                    yield row, RuntimeError(msg)
+                else:
+                    yield row, record
+        finally:
+            # a consumer which stops early should not wait for the prefetches
+            for _, future in pending:
+                future.cancel()
+
+
+def fetch_from_cms(
+    identity: Identity,
+    cms_id: CampusOnlineID,
+    cms_service: CampusOnlineRESTService,
+) -> tuple[Element, str]:
+    """Fetch the metadata and download the file of the thesis from campusonline."""
     try:
-        thesis = cms_service.get_metadata(identity, cms_id)
-        file_path = cms_service.download_file(identity, cms_id)
+        with rate_limit("cms"):
+            thesis = cms_service.get_metadata(identity, cms_id)
+        with rate_limit("cms"):
+            file_path = cms_service.download_file(identity, cms_id)
     except CampusOnlineRESTError as error:
         msg = f"ERROR: CampusOnlineRESTError cms_id: {cms_id}, msg: {error}"
         raise RuntimeError(msg) from error
 
+    return thesis, file_path
+
+
+def create_from_cms(
+    identity: Identity,
+    cms_id: CampusOnlineID,
+    thesis: Element,
+    file_path: str,
+) -> RecordItem:
+    """Create the draft of the fetched thesis and its workflow entry.
+
+    Raise RuntimeError if cms_id has an entry already, the draft is deleted
+    then.
+    """
+    marc21_service = current_records_marc21.records_service
+    theses_service = current_workflows_tugraz.theses_service
+
     marc21_record = Marc21Metadata()
     converter = CampusOnlineToMarc21(marc21_record)
     converter.convert(thesis, marc21_record)
@@ -204,12 +371,106 @@ def theses_import_from_cms_func(
         msg = f"ValidationError cms_id: {cms_id}, error: {error}"
         raise RuntimeError(msg) from error
 
-    theses_service.create(identity, record.id, cms_id)
+    try:
+        theses_service.create(identity, record.id, cms_id)
+    except IntegrityError as error:
+        # another import of cms_id was faster, the unique index refuses this one
+        db.session.rollback()
+        marc21_service.delete_draft(identity=identity, id_=record.id)
+        msg = f"ERROR: IntegrityError cms_id: {cms_id} has been imported already"
+        raise RuntimeError(msg) from error
+
+    register_created(CampusOnlineId(cms_id), record.id)
     theses_service.set_state(identity, id_=record.id, state="imported_in_repo")
 
     return record
 
 
+@tracked
+def theses_import_from_cms_func(
+    identity: Identity,
+    cms_id: CampusOnlineID,
+    cms_service: CampusOnlineRESTService,
+) -> RecordItem:
+    """Import the record into the repository from campusonline."""
+    try:
+        check_about_duplicate(CampusOnlineId(cms_id))
+    except DuplicateRecordError as error:
+        raise RuntimeError(str(error)) from error
+
+    with download_workspace("theses") as workspace:
+        thesis, file_path = fetch_from_cms(identity, cms_id, cms_service)
+        file_path = workspace.adopt(file_path)
+        return create_from_cms(identity, cms_id, thesis, file_path)
+
+
+def theses_import_from_cms_many(
+    identity: Identity,
+    cms_ids: Iterable[CampusOnlineID],
+    cms_service: CampusOnlineRESTService,
+    prefetch: int | None = None,
+) -> Iterator[tuple[str, RecordItem | RuntimeError]]:
+    """Import the theses of cms_ids, yield the record or the error per cms_id.
+
+    Metadata and files of the next prefetch theses are fetched on a thread
+    pool while the current one is converted and written. The writes stay on
+    the calling thread, one after the other, so the db session is not
+    shared. Already imported cms_ids are skipped up front, by
+    WORKFLOWS_CAMPUSONLINE_DUPLICATE_MANY_FUNC.
+    """
+    prefetch = prefetch or current_app.config["WORKFLOWS_TUGRAZ_CMS_IMPORT_PREFETCH"]
+    duplicate_many = current_app.config["CAMPUSONLINE_DUPLICATE_MANY_FUNC"]
+    app = current_app._get_current_object()  # noqa: SLF001
+
+    cms_ids = [str(cms_id) for cms_id in cms_ids]
+    duplicates = duplicate_many(cms_ids)
+    cms_ids = iter([cms_id for cms_id in cms_ids if cms_id not in duplicates])
+
+    with (
+        track_run("theses-import-from-cms") as run,
+        download_workspace("theses") as workspace,
+        ThreadPoolExecutor(max_workers=prefetch) as executor,
+    ):
+
+        def fetch(cms_id: str) -> tuple[Element, str]:
+            with app.app_context():
+                thesis, file_path = fetch_from_cms(identity, cms_id, cms_service)
+                return thesis, workspace.adopt(file_path)
+
+        pending = deque(
+            (cms_id, executor.submit(fetch, cms_id))
+            for cms_id in islice(cms_ids, prefetch)
+        )
+
+        try:
+            while pending:
+                cms_id, future = pending.popleft()
+                if (next_id := next(cms_ids, None)) is not None:
+                    pending.append((next_id, executor.submit(fetch, next_id)))
+
+                try:
+                    with run.item():
+                        thesis, file_path = future.result()
+                        try:
+                            record = create_from_cms(
+                                identity,
+                                cms_id,
+                                thesis,
+                                file_path,
+                            )
+                        finally:
+                            workspace.remove(file_path)
+                except RuntimeError as error:
+                    yield cms_id, error
+                else:
+                    yield cms_id, record
+        finally:
+            # a consumer which stops early should not wait for the prefetches
+            for _, future in pending:
+                future.cancel()
+
+
+@tracked
 def theses_create_func(
     identity: Identity,
     marc_id: str,
@@ -224,7 +485,7 @@ def theses_create_func(
     marc21_service = current_records_marc21.records_service
     theses_service = current_workflows_tugraz.theses_service
 
-    if is_duplicate_in_alma(cms_id):
+    if is_duplicate(cms_id):
         msg = f"WARNING: duplicate in alma cms_id: {cms_id}"
         raise RuntimeWarning(msg)
 
@@ -237,14 +498,17 @@ def theses_create_func(
     marc21_record_etree = convert_json_to_marc21xml(record.to_dict()["metadata"])
 
     try:
-        alma_service.create_record(marc21_record_etree)
+        with rate_limit("alma"):
+            alma_service.create_record(marc21_record_etree)
     except AlmaRESTError as error:
+        theses_service.register_failure(identity, id_=marc_id)
         msg = f"ERROR: alma rest error on marc_id: {marc_id}, cms_id: {cms_id}, error: {error}"
         raise RuntimeError(msg) from error
 
     theses_service.set_state(identity, id_=marc_id, state="created_in_alma")
 
 
+@tracked
 def theses_update_func(
     identity: Identity,
     marc_id: str,
@@ -257,19 +521,20 @@ def theses_update_func(
 
     :param bool update_access: normally true, but if updated by cli it would be
     nice to update records without worring to mess up the access.
+
+    If the metadata and the access are the same as by the last update, the
+    record is not edited and published again, the state advances anyway.
     """
     marc21_service = current_records_marc21.records_service
     theses_service = current_workflows_tugraz.theses_service
 
     try:
-        data = marc21_service.read_draft(id_=marc_id, identity=identity).data
-    except (NoResultFound, PIDDoesNotExistError):
-        try:
-            # if this raises also the NoResultFound error it should break!
-            data = marc21_service.read(id_=marc_id, identity=identity).data
-        except (NoResultFound, PIDDoesNotExistError) as error:
-            msg = f"ERROR: update record marc_id: {marc_id}, cms_id: {cms_id} not found in db"
-            raise RuntimeError(msg) from error
+        data = read_draft_or_record(identity, marc_id).data
+    except (NoResultFound, PIDDoesNotExistError) as error:
+        msg = (
+            f"ERROR: update record marc_id: {marc_id}, cms_id: {cms_id} not found in db"
+        )
+        raise RuntimeError(msg) from error
 
     if update_access:
         db_marc21_record = Marc21Metadata(json=data["metadata"])
@@ -306,8 +571,9 @@ def theses_update_func(
         data["access"]["files"] = "restricted" if is_restricted else "public"
 
     try:
-        alma_marc21_etree = alma_service.get_record(cms_id, "local_field_995")
+        alma_marc21_etree = get_alma_record(cms_id, alma_service)
     except (AlmaRESTError, AlmaAPIError) as error:
+        theses_service.register_failure(identity, id_=marc_id)
         msg = f"ERROR: alma rest marc_id: {marc_id}, cms_id: {cms_id}, error: {error}"
         raise RuntimeError(msg) from error
 
@@ -325,20 +591,39 @@ def theses_update_func(
 
     data["metadata"] = alma_marc21_record.json["metadata"]
 
-    try:
-        marc21_service.edit(id_=marc_id, identity=identity)
-        marc21_service.update_draft(id_=marc_id, identity=identity, data=data)
-        marc21_service.publish(id_=marc_id, identity=identity)
-    except ValidationError as error:
-        msg = f"ValidationError cms_id: {cms_id}, error: {error}"
-        raise RuntimeError(msg) from error
-    except RequestError as error:
-        msg = f"RequestError cms_id: {cms_id}, error: {error}"
-        raise RuntimeError(msg) from error
+    alma_hash = content_hash({"metadata": data["metadata"], "access": data["access"]})
+    if alma_hash != theses_service.alma_hash(identity, marc_id):
+        try:
+            marc21_service.edit(id_=marc_id, identity=identity)
+            marc21_service.update_draft(id_=marc_id, identity=identity, data=data)
+            marc21_service.publish(id_=marc_id, identity=identity)
+        except ValidationError as error:
+            msg = f"ValidationError cms_id: {cms_id}, error: {error}"
+            raise RuntimeError(msg) from error
+        except RequestError as error:
+            msg = f"RequestError cms_id: {cms_id}, error: {error}"
+            raise RuntimeError(msg) from error
+
+        theses_service.set_alma_hash(identity, marc_id, alma_hash)
 
     theses_service.set_state(identity, id_=marc_id, state="updated_in_repo")
 
 
+def theses_duplicate_many(cms_ids: list[str]) -> set[str]:
+    """Get the cms_ids out of cms_ids which have already been imported.
+
+    A whole harvest page is resolved by one lookup of the workflows_theses
+    entries and one terms query for those which have none.
+    """
+    theses_service = current_workflows_tugraz.theses_service
+    cms_ids = [str(cms_id) for cms_id in cms_ids]
+
+    duplicates = theses_service.known_cms_ids(system_identity, cms_ids)
+    if unknown := [cms_id for cms_id in cms_ids if cms_id not in duplicates]:
+        duplicates |= search_values(CampusOnlineId.category, unknown)
+    return duplicates
+
+
 def theses_duplicate_func(cms_id: str) -> bool:
     """Check if the cms_id has already been imported."""
     try:
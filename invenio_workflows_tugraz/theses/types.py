@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2022 Graz University of Technology.
+# Copyright (C) 2022-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -8,6 +8,8 @@
 
 """Theses Workflows."""
 
+from enum import IntEnum
+
 from invenio_records_marc21.services.record.types import Marc21Category
 
 
@@ -15,3 +17,14 @@ class CampusOnlineId(Marc21Category):
     """Campus online ID."""
 
     category: str = "995.subfields.a.keyword"
+
+
+class ThesesStage(IntEnum):
+    """Stages of the theses pipeline in the order they are passed."""
+
+    NEW = 0
+    IMPORTED_IN_REPO = 1
+    ARCHIVED_IN_CMS = 2
+    CREATED_IN_ALMA = 3
+    UPDATED_IN_REPO = 4
+    PUBLISHED_IN_CMS = 5
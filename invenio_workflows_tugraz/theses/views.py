@@ -2,7 +2,7 @@
 #
 # This file is part of Invenio.
 #
-# Copyright (C) 2022-2024 Graz University of Technology.
+# Copyright (C) 2022-2026 Graz University of Technology.
 #
 # Invenio-Records-Marc21 is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -15,13 +15,13 @@ from flask import Blueprint, Flask, g, redirect
 from invenio_records_marc21.proxies import current_records_marc21
 from werkzeug.wrappers import Response as BaseResponse
 
-from .decorators import pass_record_from_pid
+from .decorators import pass_record_from_pid, record_url
 
 
-@pass_record_from_pid
-def record_from_pid(record: dict, **__: dict) -> BaseResponse:
+@pass_record_from_pid(light=True)
+def record_from_pid(record_id: str, **__: dict) -> BaseResponse:
     """Redirect to record's latest version page."""
-    return redirect(record["links"]["self_html"], code=301)
+    return redirect(record_url(g.identity, record_id), code=301)
 
 
 @pass_record_from_pid
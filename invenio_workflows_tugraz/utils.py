@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Utils for workflows."""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from json import dumps
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import Column
+from sqlalchemy.orm import Query
+
+
+def keyset_paginate(query: Query, key: Column, page_size: int) -> Iterator:
+    """Stream the rows of query page by page ordered by key.
+
+    Each page is a fresh query starting after the last key of the previous
+    page, so the consumer is free to commit between rows and rows which
+    leave the predicate while streaming don't shift the following pages.
+    """
+    last_key = None
+    while True:
+        page_query = query.order_by(key)
+        if last_key is not None:
+            page_query = page_query.filter(key > last_key)
+
+        # the page is loaded completely before it is handed out, a server side
+        # cursor would not survive the commits of the consumer
+        page = page_query.limit(page_size).all()
+        yield from page
+
+        if len(page) < page_size:
+            return
+        last_key = getattr(page[-1], key.key)
+
+
+def percentiles(
+    values: list[float],
+    ranks: tuple[int, ...] = (50, 90, 99),
+) -> dict[str, float]:
+    """Get the nearest rank percentiles of values."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {f"p{rank}": ordered[round(last * rank / 100)] for rank in ranks}
+
+
+def backoff_until(attempts: int, base_delay: int, max_delay: int) -> datetime:
+    """Get the moment the next attempt is due after attempts failed attempts.
+
+    The delay doubles with every failed attempt, starting with base_delay
+    seconds, up to max_delay seconds.
+    """
+    delay = min(base_delay * 2 ** max(attempts - 1, 0), max_delay)
+    return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+
+def content_hash(data: dict) -> str:
+    """Get the sha256 of data, independent of the order of the keys."""
+    normalized = dumps(data, sort_keys=True, separators=(",", ":"))
+    return sha256(normalized.encode()).hexdigest()
+
+
+class TTLCache:
+    """Least recently used cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Construct TTLCache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any | None:  # noqa: ANN401
+        """Get the value of key, None if it is missing or expired."""
+        with self._lock:
+            expires, value = self._entries.get(key, (0.0, None))
+            if expires < monotonic():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """Set the value of key, the least recently used entry may be dropped."""
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
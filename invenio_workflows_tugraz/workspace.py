@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Scratch space of the files downloaded by the imports."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import count
+from pathlib import Path
+from shutil import move, rmtree
+from tempfile import gettempdir, mkdtemp
+from threading import Lock
+
+from flask import current_app
+
+from .runs import active_run
+
+
+class DownloadWorkspace:
+    """Directory which holds the downloaded files of an import.
+
+    The bytes of the held files are counted, the quota bounds the files
+    which an import holds at the same time.
+    """
+
+    def __init__(self, path: Path, quota: int | None) -> None:
+        """Construct DownloadWorkspace.
+
+        The usage of the workspace is recorded to the run which is active on
+        construction, also for files adopted by other threads.
+        """
+        self.path = path
+        self.quota = quota
+        self.usage = 0
+        self.run = active_run()
+        self._sizes: dict[Path, int] = {}
+        self._numbers = count()
+        self._lock = Lock()
+
+    def adopt(self, file_path: str) -> str:
+        """Move a downloaded file into the workspace, return its new path.
+
+        Raise RuntimeError if the file would exceed the quota, the file is
+        removed then instead of moved.
+        """
+        source = Path(file_path)
+        size = source.stat().st_size
+        with self._lock:
+            if self.quota and self.usage + size > self.quota:
+                source.unlink()
+                msg = (
+                    f"ERROR: scratch quota exceeded by {file_path}, usage: {self.usage}"
+                )
+                raise RuntimeError(msg)
+
+            target = self.path / f"{next(self._numbers)}-{source.name}"
+            move(source, target)
+
+            self._sizes[target] = size
+            self.usage += size
+            if self.run:
+                self.run.gauge("scratch_bytes", self.usage)
+
+        return str(target)
+
+    def remove(self, file_path: str) -> None:
+        """Remove a file of the workspace, once it has been stored."""
+        target = Path(file_path)
+        target.unlink(missing_ok=True)
+        with self._lock:
+            self.usage -= self._sizes.pop(target, 0)
+
+
+@contextmanager
+def download_workspace(name: str) -> Iterator[DownloadWorkspace]:
+    """Allocate a workspace below WORKFLOWS_TUGRAZ_SCRATCH_DIR.
+
+    The workspace and all files in it are removed on exit, whether the
+    import succeeded or failed.
+    """
+    root = current_app.config["WORKFLOWS_TUGRAZ_SCRATCH_DIR"]
+    root = Path(root) if root else Path(gettempdir()) / "invenio-workflows-tugraz"
+    root.mkdir(parents=True, exist_ok=True)
+    quota = current_app.config["WORKFLOWS_TUGRAZ_SCRATCH_QUOTA"]
+
+    path = Path(mkdtemp(prefix=f"{name}-", dir=root))
+    try:
+        yield DownloadWorkspace(path, quota)
+    finally:
+        rmtree(path, ignore_errors=True)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test alma."""
+
+from types import SimpleNamespace
+from typing import NamedTuple
+from xml.etree.ElementTree import Element, fromstring
+
+import pytest
+from flask import Flask
+
+from invenio_workflows_tugraz import alma as alma_module
+from invenio_workflows_tugraz.alma import (
+    alma_absent_iter,
+    alma_prefetch_iter,
+    get_alma_record,
+    is_duplicate,
+)
+
+RECORD_XML = """
+<record xmlns="http://www.loc.gov/MARC21/slim">
+  <controlfield tag="009">AC{id_}</controlfield>
+  <datafield ind1=" " ind2=" " tag="995">
+    <subfield code="a">{id_}</subfield>
+  </datafield>
+</record>
+"""
+
+
+class MockSRUService:
+    """Mock AlmaSRUService class, alma has records of all ids but missing."""
+
+    def __init__(self, missing: set[str]) -> None:
+        """Construct MockSRUService."""
+        self.missing = missing
+        self.queries: list[str] = []
+
+    def get_record(self, search_value: str | int, *_: tuple) -> list[Element]:
+        """Mock get record."""
+        search_value = str(search_value)
+        self.queries.append(search_value)
+        ids = search_value.split(" or alma.local_field_995=")
+        return [
+            fromstring(RECORD_XML.format(id_=id_))  # noqa: S314
+            for id_ in ids
+            if id_ not in self.missing
+        ]
+
+
+class Entry(NamedTuple):
+    """Workflow entry."""
+
+    pid: str
+    cms_id: int
+
+
+def test_alma_prefetch(app: Flask) -> None:
+    """Test that the alma records of a chunk of int cms_ids are fetched once."""
+    sru_service = MockSRUService(missing={"3"})
+    entries = [Entry(f"pid-{number}", number) for number in range(1, 6)]
+
+    fetched = {}
+    for entry in alma_prefetch_iter(entries, chunk_size=3):
+        fetched[entry.cms_id] = get_alma_record(entry.cms_id, sru_service)
+
+    assert sru_service.queries == [
+        "1 or alma.local_field_995=2 or alma.local_field_995=3",
+        "3",
+        "4 or alma.local_field_995=5",
+    ]
+    assert [len(records) for records in fetched.values()] == [1, 1, 0, 1, 1]
+
+
+def test_alma_absent_iter(app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that duplicates are dropped and the others are not probed again."""
+    sru_service = MockSRUService(missing={"2", "4", "5"})
+    monkeypatch.setattr(
+        alma_module,
+        "current_alma",
+        SimpleNamespace(alma_sru_service=sru_service),
+    )
+
+    def is_duplicate_in_alma(id_: str | int) -> bool:
+        sru_service.queries.append(str(id_))
+        return False
+
+    monkeypatch.setattr(alma_module, "is_duplicate_in_alma", is_duplicate_in_alma)
+
+    entries = [Entry(f"pid-{number}", number) for number in range(1, 6)]
+    created = [
+        entry.cms_id
+        for entry in alma_absent_iter(entries, chunk_size=3)
+        if not is_duplicate(entry.cms_id)
+    ]
+
+    assert created == [2, 4, 5]
+    assert sru_service.queries == [
+        "1 or alma.local_field_995=2 or alma.local_field_995=3",
+        "4 or alma.local_field_995=5",
+    ]
+
+    assert not is_duplicate(2)
+    assert sru_service.queries[-1] == "2"
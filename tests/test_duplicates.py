@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test duplicates."""
+
+import pytest
+from flask_sqlalchemy import SQLAlchemy
+from invenio_records_marc21 import DuplicateRecordError
+from invenio_records_marc21.services.record.types import ACNumber
+
+from invenio_workflows_tugraz import duplicates as duplicates_module
+from invenio_workflows_tugraz.duplicates import (
+    DuplicateRegistry,
+    check_duplicate,
+    extract_values,
+    register_created,
+    split_category,
+)
+from invenio_workflows_tugraz.proxies import current_workflows_tugraz
+from invenio_workflows_tugraz.runs import track_run
+
+
+def test_split_category() -> None:
+    """Test the split of a category into tag and subfield code."""
+    assert split_category("995.subfields.a.keyword") == ("995", "a")
+    assert split_category("009.keyword") == ("009", None)
+
+
+def test_extract_values() -> None:
+    """Test the extraction of the values from the marc21 fields."""
+    fields = {
+        "009": "AC12345678",
+        "995": [
+            {"ind1": " ", "ind2": " ", "subfields": {"a": ["1234"], "9": ["x"]}},
+            {"ind1": " ", "ind2": " ", "subfields": {"a": ["5678"]}},
+        ],
+    }
+    assert extract_values(fields, "995", "a") == {"1234", "5678"}
+    assert extract_values(fields, "009", None) == {"AC12345678"}
+    assert extract_values(fields, "024", "a") == set()
+
+
+def test_check_duplicate(db: SQLAlchemy, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a run loads a category once and found duplicates are cached."""
+    searches = []
+
+    def search_ids(category: str, values: list[str] | None = None) -> dict:
+        searches.append(values)
+        ids = {"AC1": "abcde-12345", "AC3": "klmno-13579"}
+        return {value: ids[value] for value in values or ids if value in ids}
+
+    monkeypatch.setattr(duplicates_module, "search_ids", search_ids)
+    registry = DuplicateRegistry()
+    monkeypatch.setattr(current_workflows_tugraz, "duplicate_registry", registry)
+
+    with pytest.raises(DuplicateRecordError):
+        check_duplicate(ACNumber("AC1"))
+    check_duplicate(ACNumber("AC2"))
+    check_duplicate(ACNumber("AC2"))
+    assert searches == [["AC1"], ["AC2"], ["AC2"]]
+
+    with track_run("test-duplicates"):
+        check_duplicate(ACNumber("AC2"))
+        check_duplicate(ACNumber("AC4"))
+        with pytest.raises(DuplicateRecordError, match="klmno-13579"):
+            check_duplicate(ACNumber("AC3"))
+        check_duplicate(ACNumber("AC5"))
+    assert searches[3:] == [["AC2"], None]
+
+    register_created(ACNumber("AC2"), "fghij-67890")
+    with pytest.raises(DuplicateRecordError, match="fghij-67890"):
+        check_duplicate(ACNumber("AC2"))
+    with pytest.raises(DuplicateRecordError):
+        check_duplicate(ACNumber("AC1"))
+    assert len(searches) == 5  # noqa: PLR2004
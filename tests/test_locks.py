@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test locks."""
+
+from flask_sqlalchemy import SQLAlchemy
+
+from invenio_workflows_tugraz.locks import (
+    acquire_lease,
+    holds_lease,
+    locked_iter,
+    release_lease,
+    run_lock,
+)
+
+
+def test_run_lock(db: SQLAlchemy) -> None:
+    """Test that a held run lock excludes a second run."""
+    with run_lock("test-run") as acquired:
+        assert acquired
+
+        with run_lock("test-run") as acquired_twice:
+            assert not acquired_twice
+
+        with run_lock("test-run", shared=True) as acquired_shared:
+            assert not acquired_shared
+
+        with run_lock("other-run") as acquired_other:
+            assert acquired_other
+
+    with run_lock("test-run", shared=True) as first:
+        with run_lock("test-run", shared=True) as second:
+            assert first
+            assert second
+
+        with run_lock("test-run") as exclusive:
+            assert not exclusive
+
+    with run_lock("test-run") as acquired:
+        assert acquired
+
+
+def test_locked_iter(db: SQLAlchemy) -> None:
+    """Test that an overlapping stream gets no entries."""
+    stream = locked_iter("test-stream", range(3))
+    assert next(stream) == 0
+
+    assert list(locked_iter("test-stream", range(3))) == []
+    assert list(stream) == [1, 2]
+
+    assert list(locked_iter("test-stream", range(3))) == [0, 1, 2]
+
+
+def test_lease(db: SQLAlchemy) -> None:
+    """Test that a lease excludes other runs until it is released or expired."""
+    token = acquire_lease("test-lease", ttl=60)
+    assert token
+    assert holds_lease("test-lease", token)
+    assert acquire_lease("test-lease", ttl=60) is None
+
+    release_lease("test-lease", "other-token")
+    assert holds_lease("test-lease", token)
+
+    release_lease("test-lease", token)
+    assert not holds_lease("test-lease", token)
+
+    expired = acquire_lease("test-lease", ttl=-1)
+    assert not holds_lease("test-lease", expired)
+
+    taken_over = acquire_lease("test-lease", ttl=60)
+    assert taken_over
+    assert not holds_lease("test-lease", expired)
+    assert holds_lease("test-lease", taken_over)
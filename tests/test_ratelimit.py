@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test rate limit."""
+
+from pathlib import Path
+
+from invenio_workflows_tugraz.ratelimit import TokenBucket
+
+
+def test_token_bucket(tmp_path: Path) -> None:
+    """Test that the bucket allows a burst of capacity and then waits."""
+    bucket = TokenBucket(tmp_path / "buckets.sqlite", rate=2)
+
+    assert bucket.take("alma") == 0
+    assert bucket.take("alma") == 0
+    assert bucket.take("alma") > 0
+
+    # the buckets are independent of each other
+    assert bucket.take("cms") == 0
+
+    # a second bucket object on the same file shares the state
+    other = TokenBucket(tmp_path / "buckets.sqlite", rate=2)
+    assert other.take("alma") > 0
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test resolver."""
+
+import pytest
+from _pytest.fixtures import FixtureFunctionMarker
+from invenio_access.permissions import system_identity
+from invenio_pidstore.errors import PIDDoesNotExistError
+from invenio_records_marc21 import create_record, current_records_marc21
+
+from invenio_workflows_tugraz.resolver import read_draft_or_record, resolve_marc21
+
+
+def test_resolve_marc21(running_app: FixtureFunctionMarker) -> None:
+    """Test that a draft is resolved and read by a single lookup."""
+    data = {
+        "files": {"enabled": False},
+        "access": {"record": "public", "files": "public"},
+    }
+    draft = create_record(
+        current_records_marc21.records_service,
+        data=data,
+        file_paths=[],
+        identity=system_identity,
+        do_publish=False,
+    )
+
+    resolution = resolve_marc21(draft.id)
+    assert (resolution.id, resolution.has_draft, resolution.has_record) == (
+        draft.id,
+        True,
+        False,
+    )
+    assert resolution.uuid is not None
+    assert read_draft_or_record(system_identity, draft.id).id == draft.id
+
+    assert resolve_marc21("abcde-12345") is None
+    with pytest.raises(PIDDoesNotExistError):
+        read_draft_or_record(system_identity, "abcde-12345")
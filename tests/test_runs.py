@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test runs."""
+
+import pytest
+from flask_sqlalchemy import SQLAlchemy
+
+from invenio_workflows_tugraz.runs import (
+    WorkflowRun,
+    active_run,
+    track_run,
+    tracked,
+    tracked_iter,
+)
+
+
+def test_track_run(db: SQLAlchemy) -> None:
+    """Test that the counters and the histogram of a run are written."""
+    with track_run("test-run") as run:
+        assert active_run() is run
+        for _ in range(3):
+            with run.item():
+                pass
+        with pytest.raises(RuntimeError), run.item():
+            raise RuntimeError
+
+    assert active_run() is None
+
+    (model,) = WorkflowRun.latest(name="test-run")
+    assert model.ended is not None
+    assert model.processed == 4  # noqa: PLR2004
+    assert model.failed == 1
+    assert sum(model.metrics["histogram"].values()) == 4  # noqa: PLR2004
+    assert "p95" in model.metrics
+
+
+def test_tracked(db: SQLAlchemy) -> None:
+    """Test that a call is recorded to the active run or to a run of its own."""
+
+    @tracked
+    def func(value: int) -> int:
+        return value
+
+    runs = len(WorkflowRun.latest(limit=1000))
+    assert func(1) == 1
+    (single,) = WorkflowRun.latest(name="func")
+    assert single.processed == 1
+
+    for value in tracked_iter("test-stream", range(2)):
+        func(value)
+
+    (stream,) = WorkflowRun.latest(name="test-stream")
+    assert stream.processed == 2  # noqa: PLR2004
+    assert len(WorkflowRun.latest(limit=1000)) == runs + 2
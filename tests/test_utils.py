@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test utils."""
+
+from invenio_workflows_tugraz.utils import TTLCache
+
+
+def test_ttl_cache() -> None:
+    """Test that the least recently used and the expired entries are dropped."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3  # noqa: PLR2004
+
+    expired = TTLCache(maxsize=2, ttl=-1)
+    expired.set("a", 1)
+    assert expired.get("a") is None
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test workspace."""
+
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from invenio_workflows_tugraz.workspace import download_workspace
+
+
+def test_download_workspace(app: Flask, tmp_path: Path) -> None:
+    """Test that the files are moved into the workspace and removed on exit."""
+    app.config["WORKFLOWS_TUGRAZ_SCRATCH_DIR"] = tmp_path / "scratch"
+    app.config["WORKFLOWS_TUGRAZ_SCRATCH_QUOTA"] = 16
+
+    downloaded = tmp_path / "thesis.pdf"
+    downloaded.write_bytes(b"hello world")
+
+    with download_workspace("test") as workspace:
+        file_path = workspace.adopt(str(downloaded))
+        assert not downloaded.exists()
+        assert Path(file_path).read_bytes() == b"hello world"
+
+        too_large = tmp_path / "large.pdf"
+        too_large.write_bytes(b"hello world")
+        with pytest.raises(RuntimeError):
+            workspace.adopt(str(too_large))
+        assert not too_large.exists()
+        assert list(workspace.path.iterdir()) == [Path(file_path)]
+
+        workspace.remove(file_path)
+        assert workspace.usage == 0
+
+        too_large.write_bytes(b"hello world")
+        workspace.adopt(str(too_large))
+        assert workspace.usage == len(b"hello world")
+
+    assert list((tmp_path / "scratch").iterdir()) == []
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test theses api."""
+
+from datetime import datetime, timedelta, timezone
+
+from flask_sqlalchemy import SQLAlchemy
+from invenio_access.permissions import system_identity
+
+from invenio_workflows_tugraz.proxies import current_workflows_tugraz
+from invenio_workflows_tugraz.theses.api import HarvestMark, WorkflowTheses
+from invenio_workflows_tugraz.theses.types import ThesesStage
+
+
+def test_set_state_moves_stage_forward(db: SQLAlchemy) -> None:
+    """Test that set_state never moves an entry back."""
+    entry = WorkflowTheses.create("abcde-12345", "1")
+    assert entry.stage == ThesesStage.NEW
+
+    entry.set_state("archived_in_cms")
+    assert entry.stage == ThesesStage.ARCHIVED_IN_CMS
+
+    entry.set_state("imported_in_repo")
+    assert entry.stage == ThesesStage.ARCHIVED_IN_CMS
+
+    entry.set_state("unknown")
+    assert entry.stage == ThesesStage.ARCHIVED_IN_CMS
+
+
+def test_ready_to(db: SQLAlchemy) -> None:
+    """Test the ready to lookups and the bulk state transition."""
+    for number in range(7):
+        WorkflowTheses.create(f"pid-{number}", str(number)).set_state(
+            "imported_in_repo",
+        )
+    WorkflowTheses.create("pid-new", "100")
+
+    ready = WorkflowTheses.iter_ready_to("archive_in_cms", page_size=3)
+    assert [entry.pid for entry in ready] == [f"pid-{n}" for n in range(7)]
+
+    first = WorkflowTheses.get_ready_to("archive_in_cms", limit=2)
+    assert [entry.pid for entry in first] == ["pid-0", "pid-1"]
+
+    updated = WorkflowTheses.set_state_many(["pid-0", "pid-1"], "archived_in_cms")
+    assert updated == 2  # noqa: PLR2004
+
+    ready = WorkflowTheses.get_ready_to("create_in_alma")
+    assert [entry.pid for entry in ready] == ["pid-0", "pid-1"]
+    assert len(WorkflowTheses.get_ready_to("archive_in_cms")) == 5  # noqa: PLR2004
+
+
+def test_transitions(db: SQLAlchemy) -> None:
+    """Test that every stage change is logged once."""
+    entry = WorkflowTheses.create("pid-transition", "1")
+    entry.set_state("imported_in_repo")
+    entry.set_state("archived_in_cms")
+    entry.set_state("archived_in_cms")
+    WorkflowTheses.set_state_many(["pid-transition"], "created_in_alma")
+
+    dwell_times = WorkflowTheses.dwell_times()
+    assert len(dwell_times[ThesesStage.IMPORTED_IN_REPO]) == 1
+    assert len(dwell_times[ThesesStage.ARCHIVED_IN_CMS]) == 1
+    assert ThesesStage.CREATED_IN_ALMA not in dwell_times
+
+    (counts,) = WorkflowTheses.throughput().values()
+    assert counts == {
+        ThesesStage.IMPORTED_IN_REPO: 1,
+        ThesesStage.ARCHIVED_IN_CMS: 1,
+        ThesesStage.CREATED_IN_ALMA: 1,
+    }
+
+
+def test_counts(db: SQLAlchemy) -> None:
+    """Test the number of entries per stage."""
+    WorkflowTheses.create("pid-imported", "1").set_state("imported_in_repo")
+    WorkflowTheses.create("pid-new", "2")
+
+    counts = WorkflowTheses.counts()
+    assert counts["new"] == 1
+    assert counts["imported_in_repo"] == 1
+    assert counts["published_in_cms"] == 0
+
+
+def test_register_failure(db: SQLAlchemy) -> None:
+    """Test that a failing entry backs off and is parked at last."""
+    entry = WorkflowTheses.create("pid-failing", "1")
+    entry.set_state("imported_in_repo")
+
+    entry.register_failure(max_attempts=2, base_delay=600, max_delay=3600)
+    assert entry.model.next_attempt_at is not None
+    assert WorkflowTheses.get_ready_to("archive_in_cms") == []
+
+    entry.register_failure(max_attempts=2, base_delay=600, max_delay=3600)
+    assert entry.model.parked
+    assert WorkflowTheses.counts()["parked"] == 1
+
+    entry.unpark()
+    ready = WorkflowTheses.get_ready_to("archive_in_cms")
+    assert [entry.pid for entry in ready] == ["pid-failing"]
+
+
+def test_known_cms_ids(db: SQLAlchemy) -> None:
+    """Test that the imported cms_ids of a harvest page are found at once."""
+    WorkflowTheses.create("pid-known", "1234")
+
+    assert WorkflowTheses.known_cms_ids(["1234", "5678", "abc"]) == {"1234"}
+
+
+def test_resolve_by_cms_id(db: SQLAlchemy) -> None:
+    """Test the lookup of an entry by its cms_id."""
+    WorkflowTheses.create("pid-cms", "4321")
+
+    assert WorkflowTheses.resolve_by_cms_id("4321").pid == "pid-cms"
+    assert WorkflowTheses.resolve_by_cms_id("8765") is None
+
+
+def test_harvest_mark(db: SQLAlchemy) -> None:
+    """Test that a finished harvest is the mark and its failures are retried."""
+    first = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    for number, (failed, finished) in enumerate(
+        [([], True), (["1", "2"], True), (["2"], False)],
+    ):
+        harvest = HarvestMark.resolve("campusonline")
+        harvest.start(first + timedelta(days=number))
+        if finished:
+            assert harvest.finish(failed, max_attempts=2) == []
+        harvest.commit()
+
+    # the unfinished third harvest neither became the mark nor failed "2"
+    harvest = HarvestMark.resolve("campusonline")
+    assert harvest.mark.day == 2  # noqa: PLR2004
+    assert harvest.failures == {"1": 1, "2": 1}
+
+    harvest.start(first + timedelta(days=3))
+    assert harvest.finish(["2"], max_attempts=2) == ["2"]
+    harvest.commit()
+
+    # "1" succeeded on retry, the parked "2" is not retried
+    harvest = HarvestMark.resolve("campusonline")
+    assert harvest.mark.day == 4  # noqa: PLR2004
+    assert harvest.failures == {"2": 2}
+    assert harvest.retry_ids(max_attempts=2) == []
+
+    harvest.reset()
+    harvest.commit()
+    harvest = HarvestMark.resolve("campusonline")
+    assert harvest.mark is None
+    assert harvest.failures == {}
+
+
+def test_alma_hash_without_entry(db: SQLAlchemy) -> None:
+    """Test that a record without workflow entry has no alma hash."""
+    theses_service = current_workflows_tugraz.theses_service
+
+    assert theses_service.alma_hash(system_identity, "abcde-12345") is None
+    theses_service.set_alma_hash(system_identity, "abcde-12345", "hash")
+    assert theses_service.alma_hash(system_identity, "abcde-12345") is None
+
+    WorkflowTheses.create("fghij-67890", "1")
+    theses_service.set_alma_hash(system_identity, "fghij-67890", "hash")
+    assert theses_service.alma_hash(system_identity, "fghij-67890") == "hash"
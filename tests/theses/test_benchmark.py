@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Benchmark the ready to queries of the theses workflow."""
+
+import pytest
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, text
+
+from invenio_workflows_tugraz.theses.api import READY_TO, WorkflowTheses
+from invenio_workflows_tugraz.theses.models import WorkflowThesesMetadata
+from invenio_workflows_tugraz.theses.types import ThesesStage
+
+ROWS = 500_000
+BATCH = 50_000
+
+
+def build_row(number: int) -> dict:
+    """Build a row, most of the rows went already through the whole pipeline."""
+    # every 100th row is stuck somewhere in between
+    if number % 100 == 0:
+        stage = (number // 100) % ThesesStage.PUBLISHED_IN_CMS + 1
+    else:
+        stage = ThesesStage.PUBLISHED_IN_CMS
+    return {"pid": f"{number:08d}-bench", "cms_id": number, "stage": stage}
+
+
+@pytest.fixture
+def seeded(db: SQLAlchemy) -> SQLAlchemy:
+    """Seed the workflows_theses table with ROWS rows."""
+    if db.engine.dialect.name != "postgresql":
+        pytest.skip("index scan assertions need postgresql")
+
+    for start in range(0, ROWS, BATCH):
+        rows = [build_row(number) for number in range(start, start + BATCH)]
+        db.session.execute(insert(WorkflowThesesMetadata), rows)
+    db.session.commit()
+    db.session.execute(text("ANALYZE workflows_theses"))
+    return db
+
+
+@pytest.mark.parametrize("state", list(READY_TO))
+def test_ready_to_uses_index_scan(seeded: SQLAlchemy, state: str) -> None:
+    """Test that each ready to query is answered by an index scan."""
+    query = WorkflowTheses.ready_to_query(state)
+    statement = query.statement.compile(
+        dialect=seeded.engine.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+
+    plan = seeded.session.execute(text(f"EXPLAIN {statement}")).scalars().all()
+    plan = "\n".join(plan)
+
+    assert "Seq Scan" not in plan
+    assert "ix_workflows_theses_stage_pid" in plan
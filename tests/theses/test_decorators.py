@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test theses decorators."""
+
+import pytest
+from flask import Flask
+from flask_principal import Identity
+from invenio_access.permissions import system_identity
+from invenio_records_resources.services.errors import PermissionDeniedError
+
+from invenio_workflows_tugraz.resolver import Marc21Resolution
+from invenio_workflows_tugraz.theses import decorators as decorators_module
+from invenio_workflows_tugraz.theses.decorators import record_url
+
+
+@pytest.mark.parametrize(
+    ("has_draft", "has_record", "expected"),
+    [
+        (True, True, "/publications/uploads/abcde-12345"),
+        (True, False, "/publications/uploads/abcde-12345"),
+        (False, True, "/publications/abcde-12345"),
+    ],
+)
+def test_record_url(
+    app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    has_draft: bool,
+    has_record: bool,
+    expected: str,
+) -> None:
+    """Test that the url is the self_html link of the draft, if there is one."""
+    checked = []
+
+    def resolve_marc21(pid_value: str) -> Marc21Resolution:
+        return Marc21Resolution(pid_value, has_draft=has_draft, has_record=has_record)
+
+    def require_read(identity: Identity, resolution: Marc21Resolution) -> None:
+        checked.append((identity, resolution.id))
+
+    monkeypatch.setattr(decorators_module, "resolve_marc21", resolve_marc21)
+    monkeypatch.setattr(decorators_module, "require_read", require_read)
+
+    assert record_url(system_identity, "abcde-12345").endswith(expected)
+    assert checked == [(system_identity, "abcde-12345")]
+
+
+def test_record_url_permission(
+    app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the url is not built if the identity may not read the record."""
+
+    def resolve_marc21(pid_value: str) -> Marc21Resolution:
+        return Marc21Resolution(pid_value, has_draft=True, has_record=False)
+
+    def require_read(*_: tuple) -> None:
+        raise PermissionDeniedError
+
+    monkeypatch.setattr(decorators_module, "resolve_marc21", resolve_marc21)
+    monkeypatch.setattr(decorators_module, "require_read", require_read)
+
+    with pytest.raises(PermissionDeniedError):
+        record_url(system_identity, "abcde-12345")
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test theses jobs."""
+
+from types import SimpleNamespace
+
+from invenio_workflows_tugraz.theses.jobs import StatusArchJob
+
+
+def test_status_job_task_arguments() -> None:
+    """Test that the chunking arguments of the schema reach the task."""
+    job_obj = SimpleNamespace(last_runs={})
+
+    arguments = StatusArchJob._build_task_arguments(job_obj, chunk_size=3)
+    assert arguments == {"chunk_size": 3, "max_parallelism": None}
+
+    arguments = StatusArchJob._build_task_arguments(job_obj)
+    assert arguments == {"chunk_size": None, "max_parallelism": None}
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test manifest."""
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from invenio_workflows_tugraz.theses import manifest as manifest_module
+from invenio_workflows_tugraz.theses.manifest import (
+    read_manifest,
+    validate_manifest,
+    write_result,
+)
+
+
+def test_validate_manifest(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that every invalid row is found by one pass."""
+    file_path = tmp_path / "thesis.pdf"
+    file_path.write_bytes(b"%PDF")
+
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text(
+        "ac_number,file_path,access,embargo\n"
+        f"AC1,{file_path},public,\n"
+        f"AC2,{tmp_path / 'missing.pdf'},public,\n"
+        f"AC3,{file_path},restricted,2030-13-01\n"
+        f"AC1,{file_path},public,\n"
+        f"AC4,{file_path},public,\n"
+        f",{file_path},public,\n",
+    )
+    monkeypatch.setattr(manifest_module, "search_values", lambda *_: {"AC4"})
+
+    valid, invalid, imported = validate_manifest(list(read_manifest(manifest)))
+
+    assert [row["line"] for row in valid] == [1]
+    assert [(row["line"], error.split(":")[0]) for row, error in invalid] == [
+        (2, "file not found"),
+        (3, "embargo not YYYY-MM-DD"),
+        (4, "duplicate in manifest"),
+        (5, "duplicate in repository"),
+        (6, "missing ac_number"),
+    ]
+    assert imported == []
+
+
+def test_resume_from_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the imported rows of a result file are skipped."""
+    file_path = tmp_path / "thesis.pdf"
+    file_path.write_bytes(b"%PDF")
+    row = {"ac_number": "AC1", "file_path": str(file_path), "line": 1}
+
+    fp = StringIO()
+    write_result(fp, row, "imported", record_id="abcde-12345")
+    write_result(fp, {**row, "ac_number": "AC2", "line": 2}, "failed", error="alma")
+
+    results = tmp_path / "manifest.results.jsonl"
+    results.write_text(fp.getvalue())
+    monkeypatch.setattr(manifest_module, "search_values", lambda *_: set())
+
+    valid, invalid, imported = validate_manifest(list(read_manifest(results)))
+
+    assert [row["ac_number"] for row in imported] == ["AC1"]
+    assert imported[0]["record_id"] == "abcde-12345"
+    assert [row["ac_number"] for row in valid] == ["AC2"]
+    assert invalid == []
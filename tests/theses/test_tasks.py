@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 Graz University of Technology.
+#
+# invenio-workflows-tugraz is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see LICENSE file for more
+# details.
+
+"""Module test theses tasks."""
+
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from flask_principal import Identity
+from flask_sqlalchemy import SQLAlchemy
+from invenio_access.permissions import system_identity
+
+from invenio_workflows_tugraz.proxies import current_workflows_tugraz
+from invenio_workflows_tugraz.theses import tasks as tasks_module
+from invenio_workflows_tugraz.theses.tasks import import_from_cms, split_into_chunks
+
+
+@pytest.mark.parametrize(
+    ("chunk_size", "max_parallelism", "expected_sizes"),
+    [
+        (3, None, [3, 3, 3, 1]),
+        (3, 2, [5, 5]),
+        (3, 10, [3, 3, 3, 1]),
+    ],
+)
+def test_split_into_chunks(
+    chunk_size: int,
+    max_parallelism: int | None,
+    expected_sizes: list[int],
+) -> None:
+    """Test that the chunk size grows to respect max_parallelism."""
+    pids = [f"pid-{number}" for number in range(10)]
+    chunks = split_into_chunks(pids, chunk_size, max_parallelism)
+
+    assert [len(chunk) for chunk in chunks] == expected_sizes
+    assert [pid for chunk in chunks for pid in chunk] == pids
+
+
+def test_import_from_cms(
+    app: Flask,
+    db: SQLAlchemy,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the mark advances and the failed imports are retried."""
+    filters = []
+
+    def fetch_all_ids(_: Identity, theses_filter: object) -> list[int]:
+        filters.append(str(theses_filter))
+        return [1, 2] if len(filters) == 1 else [3]
+
+    cms_service = SimpleNamespace(fetch_all_ids=fetch_all_ids)
+    monkeypatch.setattr(
+        tasks_module,
+        "current_campusonline",
+        SimpleNamespace(campusonline_rest_service=cms_service),
+    )
+
+    failing = {"2"}
+    imported = []
+
+    def import_many(_: Identity, cms_ids: list[str], service: object) -> Iterator:
+        assert service is cms_service
+        imported.append(cms_ids)
+        for cms_id in cms_ids:
+            yield cms_id, RuntimeError(cms_id) if cms_id in failing else cms_id
+
+    monkeypatch.setitem(app.config, "CAMPUSONLINE_IMPORT_MANY_FUNC", import_many)
+    theses_service = current_workflows_tugraz.theses_service
+
+    import_from_cms()
+    assert theses_service.harvest_mark(system_identity, "campusonline") is not None
+    assert theses_service.harvest_retry_ids(system_identity, "campusonline") == ["2"]
+
+    failing.clear()
+    import_from_cms()
+    assert imported == [["1", "2"], ["2", "3"]]
+    assert theses_service.harvest_retry_ids(system_identity, "campusonline") == []
+
+    assert "2022-11-17T00:01:00+00:00" in filters[0]
+    assert "2022-11-17T00:01:00+00:00" not in filters[1]
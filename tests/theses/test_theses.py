@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 #
-# Copyright (C) 2023-2025 Graz University of Technology.
+# Copyright (C) 2023-2026 Graz University of Technology.
 #
 # invenio-workflows-tugraz is free software; you can redistribute it and/or
 # modify it under the terms of the MIT License; see LICENSE file for more
@@ -12,6 +12,9 @@ from io import BytesIO
 from json import load
 from pathlib import Path
 from shutil import copyfileobj
+from threading import get_ident
+from types import SimpleNamespace
+from typing import ClassVar
 from xml.etree.ElementTree import Element, fromstring, parse
 
 import pytest
@@ -19,16 +22,27 @@ from _pytest.fixtures import FixtureFunctionMarker
 from decorator import decorator
 from flask import Flask
 from flask_principal import Identity
+from flask_sqlalchemy import SQLAlchemy
 from invenio_access.permissions import system_identity
 from invenio_campusonline.types import CampusOnlineID, FilePath
-from invenio_records_marc21 import Marc21Metadata
+from invenio_pidstore.errors import PIDAlreadyExistsError
+from invenio_records_marc21 import Marc21Metadata, MarcDraftProvider
 from invenio_records_marc21.proxies import current_records_marc21
 from invenio_records_resources.services.uow import UnitOfWork
 
 from invenio_workflows_tugraz.proxies import current_workflows_tugraz
+from invenio_workflows_tugraz.theses import (
+    WorkflowThesesService,
+    WorkflowThesesServiceConfig,
+)
+from invenio_workflows_tugraz.theses import theses as theses_module
+from invenio_workflows_tugraz.theses.api import WorkflowTheses
 from invenio_workflows_tugraz.theses.convert import CampusOnlineToMarc21
 from invenio_workflows_tugraz.theses.theses import (
+    create_from_cms,
+    theses_import_from_alma_many,
     theses_import_from_cms_func,
+    theses_import_from_cms_many,
     theses_update_func,
 )
 
@@ -49,6 +63,17 @@ def load_as_json(func: callable) -> any:
     return decorator(wrapper, func)
 
 
+@pytest.fixture
+def resolved_as_draft(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Read every marc21 id as a draft, which is read by the mock service."""
+
+    def read_draft_or_record(identity: Identity, id_: str) -> dict:
+        records_service = current_records_marc21.records_service
+        return records_service.read_draft(id_=id_, identity=identity)
+
+    monkeypatch.setattr(theses_module, "read_draft_or_record", read_draft_or_record)
+
+
 class BaseMockRecordService:
     """Mock RecordsService class."""
 
@@ -86,6 +111,12 @@ class BaseMockThesesService:
     ) -> None:
         """Create."""
 
+    def alma_hash(self, _: Identity, id_: str) -> str | None:
+        """Mock alma hash."""
+
+    def set_alma_hash(self, _: Identity, id_: str, alma_hash: str) -> None:
+        """Mock set alma hash."""
+
 
 class BaseMockAlmaService:
     """Mock AlmaService class."""
@@ -94,6 +125,7 @@ class BaseMockAlmaService:
         """Get record."""
 
 
+@pytest.mark.usefixtures("resolved_as_draft")
 @pytest.mark.parametrize(
     ("metadata_from_database", "file_access"),
     [
@@ -240,6 +272,72 @@ def test_update_func_keep_restricted_file_access(
     current_records_marc21.records_service = backup_records_services
 
 
+@pytest.mark.usefixtures("resolved_as_draft")
+def test_update_func_skip_unchanged(app: Flask, embargoed_record_xml: str) -> None:
+    """Test that an unchanged alma record is not edited and published again."""
+
+    class MockRecordItem:
+        """Mock RecordItem class."""
+
+        @property
+        def data(self) -> dict:
+            """Mock data."""
+            return {"metadata": {}, "access": {}}
+
+    class MockRecordsService(BaseMockRecordService):
+        """Mock RecordsService class."""
+
+        published = 0
+
+        def read_draft(self, *_: tuple, **__: dict) -> dict:
+            """Mock read_draft."""
+            return MockRecordItem()
+
+        def publish(self, *_: tuple, **__: dict) -> None:
+            """Mock publish."""
+            self.published += 1
+
+    class MockThesesService(BaseMockThesesService):
+        """Mock ThesesService class."""
+
+        hashes: ClassVar[dict] = {}
+        states: ClassVar[list] = []
+
+        def alma_hash(self, _: Identity, id_: str) -> str | None:
+            """Mock alma hash."""
+            return self.hashes.get(id_)
+
+        def set_alma_hash(self, _: Identity, id_: str, alma_hash: str) -> None:
+            """Mock set alma hash."""
+            self.hashes[id_] = alma_hash
+
+        def set_state(self, _: Identity, _id: str, state: str) -> None:
+            """Mock set state."""
+            self.states.append(state)
+
+    class MockAlmaService(BaseMockAlmaService):
+        """Mock AlmaService class."""
+
+        def get_record(self, *_: tuple, **__: dict) -> list[str]:
+            return [fromstring(embargoed_record_xml)]  # noqa: S314
+
+    backup_records_services = current_records_marc21.records_service
+    records_service = MockRecordsService()
+    theses_service = MockThesesService()
+
+    current_records_marc21.records_service = records_service
+    current_workflows_tugraz.theses_service = theses_service
+
+    theses_update_func(system_identity, "aiekd-23382", "77777", MockAlmaService())
+    theses_update_func(system_identity, "aiekd-23382", "77777", MockAlmaService())
+
+    assert records_service.published == 1
+    assert theses_service.states == ["updated_in_repo", "updated_in_repo"]
+
+    current_records_marc21.records_service = backup_records_services
+
+
+@pytest.mark.usefixtures("resolved_as_draft")
 @pytest.mark.parametrize(
     ("metadata_from_alma", "metadata_expected_in_database"),
     [
@@ -603,3 +701,152 @@ def test_convert(test: dict, expected: dict) -> None:
     visitor.visit(test, record)
 
     assert record.json == expected
+
+
+def test_import_from_cms_many(
+    app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Test that the pipelined import writes in order and skips duplicates."""
+    written = []
+
+    def fetch_from_cms(_: Identity, cms_id: str, __: object) -> tuple:
+        if cms_id == "3":
+            msg = f"ERROR: CampusOnlineRESTError cms_id: {cms_id}"
+            raise RuntimeError(msg)
+        file_path = tmp_path / f"{cms_id}.pdf"
+        file_path.write_bytes(b"hello world")
+        return Element("thesis"), str(file_path)
+
+    def create_from_cms(_: Identity, cms_id: str, __: Element, file_path: str) -> str:
+        assert Path(file_path).is_file()
+        written.append(cms_id)
+        return f"record-{cms_id}"
+
+    monkeypatch.setattr(theses_module, "fetch_from_cms", fetch_from_cms)
+    monkeypatch.setattr(theses_module, "create_from_cms", create_from_cms)
+    monkeypatch.setitem(
+        app.config,
+        "CAMPUSONLINE_DUPLICATE_MANY_FUNC",
+        lambda _: {"2"},
+    )
+
+    cms_ids = ["1", "2", "3", "4", "5"]
+    results = dict(theses_import_from_cms_many(system_identity, cms_ids, None, 2))
+
+    assert written == ["1", "4", "5"]
+    assert list(tmp_path.iterdir()) == []
+    assert results["1"] == "record-1"
+    assert isinstance(results["3"], RuntimeError)
+    assert "2" not in results
+
+
+def test_create_from_cms_duplicate(
+    app: Flask,
+    db: SQLAlchemy,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that an entry refused by the unique cms_id deletes its draft."""
+    deleted = []
+
+    class MockConverter:
+        """Mock CampusOnlineToMarc21 class."""
+
+        def __init__(self, *_: tuple) -> None:
+            """Construct MockConverter."""
+
+        def convert(self, *_: tuple) -> None:
+            """Mock convert."""
+
+    records_service = SimpleNamespace(
+        delete_draft=lambda **kwargs: deleted.append(kwargs["id_"]),
+    )
+    theses_service = WorkflowThesesService(WorkflowThesesServiceConfig.build(app))
+    monkeypatch.setattr(current_workflows_tugraz, "theses_service", theses_service)
+    monkeypatch.setattr(theses_module, "CampusOnlineToMarc21", MockConverter)
+    monkeypatch.setattr(theses_module, "extract_embargo_range", lambda _: None)
+    monkeypatch.setattr(
+        theses_module,
+        "create_record",
+        lambda *_, **__: SimpleNamespace(id="fghij-67890"),
+    )
+    monkeypatch.setattr(
+        theses_module,
+        "current_records_marc21",
+        SimpleNamespace(records_service=records_service),
+    )
+
+    WorkflowTheses.create("abcde-12345", "7")
+    db.session.commit()
+    with pytest.raises(RuntimeError, match="IntegrityError cms_id: 7"):
+        create_from_cms(system_identity, "7", Element("thesis"), "thesis.pdf")
+
+    assert deleted == ["fghij-67890"]
+    assert WorkflowTheses.resolve_by_cms_id("7").pid == "abcde-12345"
+
+
+def test_import_from_alma_many(
+    app: Flask,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    embargoed_record_xml: str,
+) -> None:
+    """Test that a failed row neither stops the import nor leaks its marcid."""
+    file_path = tmp_path / "thesis.pdf"
+    file_path.write_bytes(b"%PDF")
+    pid_values = []
+
+    def create_record(*_: tuple, **__: dict) -> SimpleNamespace:
+        pid_values.append(MarcDraftProvider.predefined_pid_value)
+        if pid_value := pid_values[-1]:
+            pid_type = "marcid"
+            raise PIDAlreadyExistsError(pid_type, pid_value)
+        return SimpleNamespace(id="abcde-12345")
+
+    class MockAlmaService(BaseMockAlmaService):
+        """Mock AlmaService class, alma has no record of AC3."""
+
+        services: ClassVar[list] = []
+
+        def __init__(self, config: str = "") -> None:
+            """Construct MockAlmaService."""
+            self.config = config
+            self.threads = set()
+            self.services.append(self)
+
+        def get_record(self, ac_number: str, *_: tuple) -> list[Element]:
+            """Mock get record."""
+            self.threads.add(get_ident())
+            if ac_number == "AC3":
+                return []
+            return [fromstring(embargoed_record_xml)]  # noqa: S314
+
+    monkeypatch.setattr(theses_module, "create_record", create_record)
+    monkeypatch.setattr(theses_module, "register_created", lambda *_: None)
+    monkeypatch.setattr(theses_module, "AlmaSRUService", MockAlmaService)
+
+    rows = [
+        {"ac_number": "AC1", "file_path": str(file_path), "marcid": "fghij-67890"},
+        {"ac_number": "AC2", "file_path": str(file_path)},
+        {"ac_number": "AC3", "file_path": str(file_path)},
+    ]
+    results = [
+        result
+        for _, result in theses_import_from_alma_many(
+            system_identity,
+            rows,
+            MockAlmaService(config="sru"),
+            workers=2,
+        )
+    ]
+    shared, *workers = MockAlmaService.services
+
+    assert "PIDAlreadyExistsError" in str(results[0])
+    assert results[1].id == "abcde-12345"
+    assert "no alma record" in str(results[2])
+    assert pid_values == ["fghij-67890", ""]
+    assert MarcDraftProvider.predefined_pid_value == ""
+    assert not shared.threads
+    assert all(len(service.threads) == 1 for service in workers)
+    assert {service.config for service in workers} == {"sru"}